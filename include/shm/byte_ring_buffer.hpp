@@ -1,23 +1,57 @@
 #pragma once
 
 #include <atomic>
+#include <cstddef>
 #include <cstdint>
 #include <cstring>
 
 namespace shm {
 
-/// @brief Shared memory ring buffer header (POD, 16 bytes).
+static constexpr uint32_t kCacheLineSize = 64;
+
+/// @brief Header layout version stored in RingHeader::version.
+/// Version 2: head/tail on separate cache lines, 192-byte header.
+static constexpr uint32_t kLayoutVersion = 2;
+
+/// @brief Shared memory ring buffer header (POD, 192 bytes).
 /// Stored at the beginning of the shared memory region.
 /// Both C++ and Python read/write this structure via raw bytes.
+///
+/// head and tail each own a cache line so that producer stores to head do
+/// not invalidate the consumer's line holding tail, and vice versa.
+/// Explicit padding (rather than alignas) keeps the struct usable on any
+/// 4-byte aligned buffer.
 struct RingHeader {
-  uint32_t head;      // Producer write position (monotonically increasing)
-  uint32_t tail;      // Consumer read position (monotonically increasing)
-  uint32_t capacity;  // Data area size (must be power of 2)
-  uint32_t reserved;  // Alignment padding
+  uint32_t head;  // Producer write position (monotonically increasing)
+  uint8_t pad0[kCacheLineSize - 4];
+  uint32_t tail;  // Consumer read position (monotonically increasing)
+  uint8_t pad1[kCacheLineSize - 4];
+  uint32_t capacity;  // Data area size (power of 2, or 2^n slots of msg_size)
+  uint32_t version;   // kLayoutVersion, set by producer
+  uint32_t msg_size;  // Fixed message size, 0 for length-prefixed records
+  uint8_t pad2[kCacheLineSize - 12];
 };
 
-static constexpr uint32_t kHeaderSize = 16;
-static_assert(sizeof(RingHeader) == kHeaderSize, "RingHeader must be 16 bytes");
+static constexpr uint32_t kHeaderSize = 3 * kCacheLineSize;
+static_assert(sizeof(RingHeader) == kHeaderSize, "RingHeader must be 192 bytes");
+static_assert(offsetof(RingHeader, tail) == kCacheLineSize, "tail must start a cache line");
+static_assert(offsetof(RingHeader, capacity) == 2 * kCacheLineSize,
+              "capacity must start a cache line");
+
+namespace detail {
+
+/// @brief Round down to the nearest power of 2.
+inline uint32_t RoundDownPow2(uint32_t v) {
+  if (v == 0) return 0;
+  v |= v >> 1;
+  v |= v >> 2;
+  v |= v >> 4;
+  v |= v >> 8;
+  v |= v >> 16;
+  return (v >> 1) + 1;
+}
+
+}  // namespace detail
 
 /// @brief SPSC byte-level ring buffer for cross-language IPC.
 ///
@@ -27,10 +61,16 @@ static_assert(sizeof(RingHeader) == kHeaderSize, "RingHeader must be 16 bytes");
 ///   - Memory fences for cross-process visibility
 ///
 /// Memory layout in shared memory:
-///   [0..15]  : RingHeader (head, tail, capacity, reserved)
-///   [16..N]  : Data area (circular buffer)
+///   [0..191]   : RingHeader (head @0, tail @64, capacity @128, version @132,
+///                msg_size @136)
+///   [192..N]   : Data area (circular buffer)
+///
+/// Message format: [4-byte length (LE)][payload][pad to 4-byte boundary]
 ///
-/// Message format: [4-byte length (LE)][payload]
+/// Records are 4-byte aligned and never wrap: when a record does not fit
+/// before the end of the data area, the producer writes a zero length
+/// marker there and places the record at offset 0, so every payload is
+/// contiguous and is copied with a single memcpy.
 ///
 /// Thread/process safety: SPSC only (one producer, one consumer).
 class ByteRingBuffer {
@@ -47,47 +87,75 @@ class ByteRingBuffer {
       // Producer initializes the header
       uint32_t data_size = total_size - kHeaderSize;
       // Round down to power of 2
-      uint32_t cap = RoundDownPow2(data_size);
-      header_->head = 0;
-      header_->tail = 0;
+      uint32_t cap = detail::RoundDownPow2(data_size);
+      std::memset(header_, 0, kHeaderSize);
       header_->capacity = cap;
-      header_->reserved = 0;
+      header_->version = kLayoutVersion;
       std::atomic_thread_fence(std::memory_order_release);
     } else {
       // Consumer reads capacity set by producer
       std::atomic_thread_fence(std::memory_order_acquire);
     }
     mask_ = header_->capacity - 1;
+    local_head_ = header_->head;
+    local_tail_ = header_->tail;
   }
 
   // ---- Producer API ----
 
   /// @brief Write a length-prefixed message: [4B len][payload].
-  /// @return true if successful, false if not enough space.
+  /// @return true if successful, false if empty, larger than Capacity(),
+  ///         or not enough space.
   bool Write(const void* data, uint32_t len) {
-    const uint32_t total = len + 4;  // 4-byte length prefix
-    if (WriteableBytes() < total) {
+    if (len == 0) {
+      return false;  // Zero length is reserved for the wrap marker
+    }
+    const uint32_t capacity = header_->capacity;
+    const uint32_t total = RecordSize(len);
+    if (total > capacity) {
       return false;
     }
 
-    const uint32_t head = header_->head;
+    const uint32_t tail = header_->tail;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    uint32_t offset = local_head_ & mask_;
+    const uint32_t room = capacity - offset;
+    if (room < total) {
+      // Record would straddle the end: mark the rest unused and publish
+      // the marker on its own, so the consumer can free that space even
+      // if the record does not fit yet
+      if (capacity - (local_head_ - tail) < room) {
+        return false;
+      }
+      const uint32_t marker = 0;
+      std::memcpy(data_ + offset, &marker, 4);
+      std::atomic_thread_fence(std::memory_order_release);
+      local_head_ += room;
+      header_->head = local_head_;
+      offset = 0;
+    }
+    if (capacity - (local_head_ - tail) < total) {
+      return false;
+    }
 
-    // Write length prefix (little-endian)
-    WriteRaw(head, &len, 4);
-    // Write payload
-    WriteRaw(head + 4, data, len);
+    // Write length prefix (little-endian) and payload
+    std::memcpy(data_ + offset, &len, 4);
+    std::memcpy(data_ + offset + 4, data, len);
 
     // Release fence: ensure data is visible before updating head
     std::atomic_thread_fence(std::memory_order_release);
-    header_->head = head + total;
+    local_head_ += total;
+    header_->head = local_head_;
     return true;
   }
 
   /// @brief Available bytes for writing.
+  /// On a consumer-side instance local_head_ is not maintained, so head is
+  /// loaded from the header as well.
   uint32_t WriteableBytes() const {
-    const uint32_t head = header_->head;
-    std::atomic_thread_fence(std::memory_order_acquire);
+    const uint32_t head = is_producer_ ? local_head_ : header_->head;
     const uint32_t tail = header_->tail;
+    std::atomic_thread_fence(std::memory_order_acquire);
     return header_->capacity - (head - tail);
   }
 
@@ -98,94 +166,236 @@ class ByteRingBuffer {
   /// @param max_len  Maximum payload size.
   /// @return Payload length, or 0 if no data available.
   uint32_t Read(void* out, uint32_t max_len) {
-    const uint32_t tail = header_->tail;
-    std::atomic_thread_fence(std::memory_order_acquire);
     const uint32_t head = header_->head;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    uint32_t tail = local_tail_;
 
-    const uint32_t available = head - tail;
-    if (available < 4) {
-      return 0;
-    }
-
-    // Read length prefix
-    uint32_t msg_len = 0;
-    ReadRaw(tail, &msg_len, 4);
-
-    if (msg_len == 0 || available < msg_len + 4) {
-      return 0;  // Incomplete message
+    const uint32_t msg_len = NextRecord(head, &tail);
+    if (msg_len == 0) {
+      return 0;  // No complete message
     }
 
     if (msg_len > max_len) {
       // Message too large for output buffer; skip it
       std::atomic_thread_fence(std::memory_order_release);
-      header_->tail = tail + msg_len + 4;
+      local_tail_ = tail + RecordSize(msg_len);
+      header_->tail = local_tail_;
       return 0;
     }
 
     // Read payload
-    ReadRaw(tail + 4, out, msg_len);
+    std::memcpy(out, data_ + (tail & mask_) + 4, msg_len);
 
     // Release fence: ensure reads complete before updating tail
     std::atomic_thread_fence(std::memory_order_release);
-    header_->tail = tail + msg_len + 4;
+    local_tail_ = tail + RecordSize(msg_len);
+    header_->tail = local_tail_;
     return msg_len;
   }
 
   /// @brief Available bytes for reading.
+  /// On a producer-side instance local_tail_ is not maintained, so tail is
+  /// loaded from the header as well.
   uint32_t ReadableBytes() const {
-    const uint32_t tail = header_->tail;
-    std::atomic_thread_fence(std::memory_order_acquire);
+    const uint32_t tail = is_producer_ ? header_->tail : local_tail_;
     const uint32_t head = header_->head;
+    std::atomic_thread_fence(std::memory_order_acquire);
     return head - tail;
   }
 
-  /// @brief Check if there is at least one complete message.
+  /// @brief Check if there is a message (or a pending wrap marker).
   bool HasData() const { return ReadableBytes() >= 4; }
 
   /// @brief Get data area capacity.
   uint32_t Capacity() const { return header_->capacity; }
 
+  /// @brief Check that the producer used the same header layout and
+  /// length-prefixed (not fixed-size) records.
+  bool IsCompatible() const {
+    return header_->version == kLayoutVersion && header_->msg_size == 0;
+  }
+
  private:
-  /// @brief Write bytes into the circular data area.
-  void WriteRaw(uint32_t pos, const void* src, uint32_t len) {
-    const uint32_t offset = pos & mask_;
-    const uint32_t first = header_->capacity - offset;
+  /// @brief Bytes taken by a record: length prefix plus payload padded to 4.
+  static uint32_t RecordSize(uint32_t len) { return 4 + ((len + 3u) & ~3u); }
 
-    if (first >= len) {
-      std::memcpy(data_ + offset, src, len);
-    } else {
-      std::memcpy(data_ + offset, src, first);
-      std::memcpy(data_, static_cast<const uint8_t*>(src) + first, len - first);
+  /// @brief Locate the next complete record, stepping over a wrap marker.
+  /// A marker is consumed on its own: tail is published past it right
+  /// away, so the producer can reuse that space before the record arrives.
+  /// @param head  Producer position loaded by the caller.
+  /// @param[in,out] pos  Read position; advanced past a wrap marker.
+  /// @return Payload length, or 0 if no complete record is available.
+  uint32_t NextRecord(uint32_t head, uint32_t* pos) {
+    uint32_t available = head - *pos;
+    if (available < 4) {
+      return 0;
+    }
+
+    uint32_t offset = *pos & mask_;
+    uint32_t msg_len = 0;
+    std::memcpy(&msg_len, data_ + offset, 4);
+    if (msg_len == 0) {
+      // Wrap marker: the record continues at offset 0
+      const uint32_t skip = header_->capacity - offset;
+      if (available < skip) {
+        return 0;
+      }
+      *pos += skip;
+      std::atomic_thread_fence(std::memory_order_release);
+      local_tail_ = *pos;
+      header_->tail = local_tail_;
+      available -= skip;
+      if (available < 4) {
+        return 0;
+      }
+      std::memcpy(&msg_len, data_, 4);
+    }
+
+    if (available < RecordSize(msg_len)) {
+      return 0;  // Incomplete message
     }
+    return msg_len;
   }
 
-  /// @brief Read bytes from the circular data area.
-  void ReadRaw(uint32_t pos, void* dst, uint32_t len) const {
-    const uint32_t offset = pos & mask_;
-    const uint32_t first = header_->capacity - offset;
+  RingHeader* header_;
+  uint8_t* data_;
+  uint32_t mask_ = 0;
+  // Each side owns one index: cache it locally and only load the other.
+  // The cache is current only on the owning side (see *Bytes() queries).
+  uint32_t local_head_ = 0;  // Producer's copy of header_->head
+  uint32_t local_tail_ = 0;  // Consumer's copy of header_->tail
+  bool is_producer_;
+};
 
-    if (first >= len) {
-      std::memcpy(dst, data_ + offset, len);
+/// @brief SPSC ring of fixed-size messages for cross-language IPC.
+///
+/// Counterpart of Python byte_ring_buffer.FixedSizeRingBuffer. Shares the
+/// RingHeader layout with ByteRingBuffer, but:
+///   - RingHeader::msg_size holds the message size
+///   - The data area is a power-of-2 number of msg_size slots
+///   - head/tail count messages, not bytes, and there is no length prefix
+///
+/// Thread/process safety: SPSC only (one producer, one consumer).
+class FixedSizeRingBuffer {
+ public:
+  /// @brief Bind to an existing shared memory region.
+  /// @param shm_base  Pointer to the start of shared memory.
+  /// @param total_size  Total shared memory size (header + data).
+  /// @param msg_size  Size of every message in bytes (> 0).
+  /// @param is_producer  If true, initialize header on first use.
+  FixedSizeRingBuffer(void* shm_base, uint32_t total_size, uint32_t msg_size,
+                      bool is_producer)
+      : header_(static_cast<RingHeader*>(shm_base)),
+        data_(static_cast<uint8_t*>(shm_base) + kHeaderSize),
+        msg_size_(msg_size),
+        is_producer_(is_producer) {
+    if (is_producer) {
+      const uint32_t slots =
+          msg_size != 0 ? detail::RoundDownPow2((total_size - kHeaderSize) / msg_size) : 0;
+      std::memset(header_, 0, kHeaderSize);
+      header_->capacity = slots * msg_size;
+      header_->version = kLayoutVersion;
+      header_->msg_size = msg_size;
+      std::atomic_thread_fence(std::memory_order_release);
     } else {
-      std::memcpy(dst, data_ + offset, first);
-      std::memcpy(static_cast<uint8_t*>(dst) + first, data_, len - first);
+      std::atomic_thread_fence(std::memory_order_acquire);
+    }
+    slots_ = msg_size != 0 ? header_->capacity / msg_size : 0;
+    local_head_ = header_->head;
+    local_tail_ = header_->tail;
+  }
+
+  // ---- Producer API ----
+
+  /// @brief Write one message into the next slot.
+  /// @return true if successful, false if len != MsgSize() or all slots are used.
+  bool Write(const void* data, uint32_t len) {
+    if (len != msg_size_ || len == 0) {
+      return false;
     }
+    const uint32_t tail = header_->tail;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    if (local_head_ - tail >= slots_) {
+      return false;
+    }
+
+    std::memcpy(SlotPtr(local_head_), data, msg_size_);
+
+    // Release fence: ensure data is visible before updating head
+    std::atomic_thread_fence(std::memory_order_release);
+    ++local_head_;
+    header_->head = local_head_;
+    return true;
   }
 
-  /// @brief Round down to the nearest power of 2.
-  static uint32_t RoundDownPow2(uint32_t v) {
-    if (v == 0) return 0;
-    v |= v >> 1;
-    v |= v >> 2;
-    v |= v >> 4;
-    v |= v >> 8;
-    v |= v >> 16;
-    return (v >> 1) + 1;
+  /// @brief Available bytes for writing (a multiple of MsgSize()).
+  uint32_t WriteableBytes() const {
+    const uint32_t head = is_producer_ ? local_head_ : header_->head;
+    const uint32_t tail = header_->tail;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    return (slots_ - (head - tail)) * msg_size_;
+  }
+
+  // ---- Consumer API ----
+
+  /// @brief Read one message.
+  /// @param[out] out  Buffer to receive the message.
+  /// @param max_len  Size of out; a message larger than this is skipped.
+  /// @return MsgSize(), or 0 if no data available.
+  uint32_t Read(void* out, uint32_t max_len) {
+    const uint32_t head = header_->head;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    if (head == local_tail_) {
+      return 0;
+    }
+
+    uint32_t copied = 0;
+    if (msg_size_ <= max_len) {
+      std::memcpy(out, SlotPtr(local_tail_), msg_size_);
+      copied = msg_size_;
+    }
+
+    // Release fence: ensure reads complete before updating tail
+    std::atomic_thread_fence(std::memory_order_release);
+    ++local_tail_;
+    header_->tail = local_tail_;
+    return copied;
+  }
+
+  /// @brief Available bytes for reading (a multiple of MsgSize()).
+  uint32_t ReadableBytes() const {
+    const uint32_t tail = is_producer_ ? header_->tail : local_tail_;
+    const uint32_t head = header_->head;
+    std::atomic_thread_fence(std::memory_order_acquire);
+    return (head - tail) * msg_size_;
+  }
+
+  /// @brief Check if there is at least one message.
+  bool HasData() const { return ReadableBytes() != 0; }
+
+  /// @brief Get data area capacity (slots * MsgSize()).
+  uint32_t Capacity() const { return header_->capacity; }
+
+  /// @brief Get the fixed message size.
+  uint32_t MsgSize() const { return msg_size_; }
+
+  /// @brief Check that the producer used the same layout and message size.
+  bool IsCompatible() const {
+    return header_->version == kLayoutVersion && msg_size_ != 0 &&
+           header_->msg_size == msg_size_;
+  }
+
+ private:
+  uint8_t* SlotPtr(uint32_t index) const {
+    return data_ + static_cast<size_t>(index & (slots_ - 1)) * msg_size_;
   }
 
   RingHeader* header_;
   uint8_t* data_;
-  uint32_t mask_ = 0;
+  uint32_t msg_size_;
+  uint32_t slots_ = 0;
+  uint32_t local_head_ = 0;  // Producer's copy of header_->head
+  uint32_t local_tail_ = 0;  // Consumer's copy of header_->tail
   bool is_producer_;
 };
 
@@ -1,23 +1,35 @@
 #pragma once
 
+#include <new>
+
 #include "byte_ring_buffer.hpp"
 #include "shared_memory.hpp"
 
 namespace shm {
 
 /// @brief High-level shared memory producer.
-/// Creates shared memory and writes length-prefixed messages.
+/// Creates shared memory and writes length-prefixed messages, or
+/// fixed-size messages without a prefix when msg_size > 0.
 class ShmProducer {
  public:
   /// @param name      Shared memory name (alphanumeric, no leading '/').
   /// @param capacity  Desired data area size in bytes.
-  ///                  Actual capacity is rounded down to power of 2.
-  ShmProducer(const char* name, uint32_t capacity)
+  ///                  Actual capacity is rounded down to power of 2
+  ///                  (power-of-2 number of msg_size slots if msg_size > 0).
+  /// @param msg_size  If > 0, every message is exactly this many bytes
+  ///                  (FixedSizeRingBuffer).
+  ShmProducer(const char* name, uint32_t capacity, uint32_t msg_size = 0)
       : shm_(name, capacity + kHeaderSize, /*create=*/true, /*persist=*/true),
-        ring_(nullptr) {
+        ring_(nullptr),
+        fixed_ring_(nullptr) {
     if (shm_.Valid()) {
-      ring_ = new (ring_storage_) ByteRingBuffer(
-          shm_.Data(), static_cast<uint32_t>(shm_.Size()), /*is_producer=*/true);
+      const uint32_t size = static_cast<uint32_t>(shm_.Size());
+      if (msg_size > 0) {
+        fixed_ring_ = new (fixed_ring_storage_)
+            FixedSizeRingBuffer(shm_.Data(), size, msg_size, /*is_producer=*/true);
+      } else {
+        ring_ = new (ring_storage_) ByteRingBuffer(shm_.Data(), size, /*is_producer=*/true);
+      }
     }
   }
 
@@ -26,6 +38,10 @@ class ShmProducer {
       ring_->~ByteRingBuffer();
       ring_ = nullptr;
     }
+    if (fixed_ring_) {
+      fixed_ring_->~FixedSizeRingBuffer();
+      fixed_ring_ = nullptr;
+    }
   }
 
   ShmProducer(const ShmProducer&) = delete;
@@ -33,12 +49,19 @@ class ShmProducer {
 
   /// @brief Write a message to shared memory.
   bool Write(const void* data, uint32_t len) {
+    if (fixed_ring_) return fixed_ring_->Write(data, len);
     return ring_ ? ring_->Write(data, len) : false;
   }
 
-  bool IsValid() const { return ring_ != nullptr; }
-  uint32_t WriteableBytes() const { return ring_ ? ring_->WriteableBytes() : 0; }
-  uint32_t Capacity() const { return ring_ ? ring_->Capacity() : 0; }
+  bool IsValid() const { return ring_ != nullptr || fixed_ring_ != nullptr; }
+  uint32_t WriteableBytes() const {
+    if (fixed_ring_) return fixed_ring_->WriteableBytes();
+    return ring_ ? ring_->WriteableBytes() : 0;
+  }
+  uint32_t Capacity() const {
+    if (fixed_ring_) return fixed_ring_->Capacity();
+    return ring_ ? ring_->Capacity() : 0;
+  }
 
   /// @brief Remove the shared memory object.
   void Destroy() { shm_.Destroy(); }
@@ -46,22 +69,42 @@ class ShmProducer {
  private:
   SharedMemory shm_;
   ByteRingBuffer* ring_;
+  FixedSizeRingBuffer* fixed_ring_;
   alignas(ByteRingBuffer) char ring_storage_[sizeof(ByteRingBuffer)]{};
+  alignas(FixedSizeRingBuffer) char fixed_ring_storage_[sizeof(FixedSizeRingBuffer)]{};
 };
 
 /// @brief High-level shared memory consumer.
-/// Opens existing shared memory and reads length-prefixed messages.
+/// Opens existing shared memory and reads length-prefixed messages, or
+/// fixed-size messages when msg_size > 0.
 class ShmConsumer {
  public:
   /// @param name  Shared memory name (must match producer).
   /// @param size  Expected total shared memory size (header + capacity).
   ///             If 0, a reasonable default is used.
-  explicit ShmConsumer(const char* name, uint32_t size = 0)
+  /// @param msg_size  Fixed message size the producer was created with,
+  ///                  or 0 for length-prefixed messages.
+  explicit ShmConsumer(const char* name, uint32_t size = 0, uint32_t msg_size = 0)
       : shm_(name, size > 0 ? size : kDefaultSize, /*create=*/false, /*persist=*/true),
-        ring_(nullptr) {
+        ring_(nullptr),
+        fixed_ring_(nullptr) {
     if (shm_.Valid()) {
-      ring_ = new (ring_storage_) ByteRingBuffer(
-          shm_.Data(), static_cast<uint32_t>(shm_.Size()), /*is_producer=*/false);
+      const uint32_t shm_size = static_cast<uint32_t>(shm_.Size());
+      // A segment with a different header layout or message size is rejected
+      if (msg_size > 0) {
+        fixed_ring_ = new (fixed_ring_storage_)
+            FixedSizeRingBuffer(shm_.Data(), shm_size, msg_size, /*is_producer=*/false);
+        if (!fixed_ring_->IsCompatible()) {
+          fixed_ring_->~FixedSizeRingBuffer();
+          fixed_ring_ = nullptr;
+        }
+      } else {
+        ring_ = new (ring_storage_) ByteRingBuffer(shm_.Data(), shm_size, /*is_producer=*/false);
+        if (!ring_->IsCompatible()) {
+          ring_->~ByteRingBuffer();
+          ring_ = nullptr;
+        }
+      }
     }
   }
 
@@ -70,6 +113,10 @@ class ShmConsumer {
       ring_->~ByteRingBuffer();
       ring_ = nullptr;
     }
+    if (fixed_ring_) {
+      fixed_ring_->~FixedSizeRingBuffer();
+      fixed_ring_ = nullptr;
+    }
   }
 
   ShmConsumer(const ShmConsumer&) = delete;
@@ -78,19 +125,31 @@ class ShmConsumer {
   /// @brief Read one message from shared memory.
   /// @return Payload length, or 0 if no data.
   uint32_t Read(void* out, uint32_t max_len) {
+    if (fixed_ring_) return fixed_ring_->Read(out, max_len);
     return ring_ ? ring_->Read(out, max_len) : 0;
   }
 
-  bool HasData() const { return ring_ && ring_->HasData(); }
-  bool IsValid() const { return ring_ != nullptr; }
-  uint32_t ReadableBytes() const { return ring_ ? ring_->ReadableBytes() : 0; }
-  uint32_t Capacity() const { return ring_ ? ring_->Capacity() : 0; }
+  bool HasData() const {
+    if (fixed_ring_) return fixed_ring_->HasData();
+    return ring_ && ring_->HasData();
+  }
+  bool IsValid() const { return ring_ != nullptr || fixed_ring_ != nullptr; }
+  uint32_t ReadableBytes() const {
+    if (fixed_ring_) return fixed_ring_->ReadableBytes();
+    return ring_ ? ring_->ReadableBytes() : 0;
+  }
+  uint32_t Capacity() const {
+    if (fixed_ring_) return fixed_ring_->Capacity();
+    return ring_ ? ring_->Capacity() : 0;
+  }
 
  private:
   static constexpr uint32_t kDefaultSize = 1920 * 1080 * 3 + kHeaderSize;
   SharedMemory shm_;
   ByteRingBuffer* ring_;
+  FixedSizeRingBuffer* fixed_ring_;
   alignas(ByteRingBuffer) char ring_storage_[sizeof(ByteRingBuffer)]{};
+  alignas(FixedSizeRingBuffer) char fixed_ring_storage_[sizeof(FixedSizeRingBuffer)]{};
 };
 
 /// @brief Static helper to remove shared memory by name.
@@ -4,29 +4,104 @@
 Compatible with C++ shm::ByteRingBuffer. Both sides use the same
 shared memory layout:
 
-  [0..3]   : head  (uint32 LE, producer writes, consumer reads)
-  [4..7]   : tail  (uint32 LE, consumer writes, producer reads)
-  [8..11]  : capacity (uint32 LE, set by producer, read-only after init)
-  [12..15] : reserved
-  [16..N]  : data area (circular buffer)
+  [0..3]     : head  (uint32 LE, producer writes, consumer reads)
+  [64..67]   : tail  (uint32 LE, consumer writes, producer reads)
+  [128..131] : capacity (uint32 LE, set by producer, read-only after init)
+  [132..135] : layout version (uint32 LE, LAYOUT_VERSION)
+  [136..139] : message size (uint32 LE, 0 = length-prefixed records)
+  [192..N]   : data area (circular buffer)
 
-Message format: [4-byte length (LE)][payload]
+head, tail and capacity each sit on their own 64-byte cache line so
+producer and consumer index stores do not falsely share a line. This
+192-byte header replaced a packed 16-byte one; the version field lets
+either side reject a segment written with the other layout.
+
+Message format: [4-byte length (LE)][payload][pad to 4-byte boundary]
+
+Records are 4-byte aligned and never wrap: when a record does not fit
+before the end of the data area, the producer writes a zero length
+marker there and places the record at offset 0. Every payload is
+therefore contiguous in shared memory. Empty messages are not allowed.
 
 Cross-language atomicity:
   - Aligned uint32 read/write is atomic on x86 and ARMv6+
   - CPython GIL provides additional serialization
   - head/tail are monotonically increasing; wrap via & mask
+  - Each side keeps its own index locally and only loads the index
+    owned by the other side, so per message it reads one shared field.
+    The cached index is current only on its owning side, so a producer
+    asking readable_bytes() (or a consumer asking writeable_bytes())
+    loads both indices from the header instead
+
+Fixed-size messages (FixedSizeRingBuffer, C++ shm::FixedSizeRingBuffer):
+when every message has the same size, the header records it and the
+data area is a power-of-two number of slots of exactly that size, with
+no length prefix. head and tail then count messages instead of bytes.
+
+Memory ordering contract:
+  - Producer: copy payload, then store-release head
+  - Consumer: load-acquire head, then read payload; after copying it
+    out, store-release tail so the producer may reuse the space
+  The C++ side issues these as std::atomic fences. CPython has no
+  fences; this module relies on the payload slice assignment being
+  issued before the header store in program order, and on x86 TSO
+  keeping stores (and loads) in that order. On weakly ordered CPUs
+  (ARM, POWER) a Python peer can observe head before the payload it
+  covers; such a deployment needs a compiled helper with real atomics.
 """
 
 from __future__ import annotations
 
-import struct
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
+
+__all__ = ["ByteRingBuffer", "FixedSizeRingBuffer", "HEADER_SIZE", "LAYOUT_VERSION"]
+
+CACHE_LINE_SIZE: int = 64
+HEADER_SIZE: int = 3 * CACHE_LINE_SIZE
+LAYOUT_VERSION: int = 2
+_U32_MASK = 0xFFFFFFFF
+
+# uint32 slots of the header, see layout above
+_HEAD = 0
+_TAIL = CACHE_LINE_SIZE // 4
+_CAP = 2 * CACHE_LINE_SIZE // 4
+_VERSION = _CAP + 1
+_MSG_SIZE = _CAP + 2
+
+
+def _record_size(msg_len: int) -> int:
+    """Bytes taken by a record: length prefix plus payload padded to 4."""
+    return 4 + ((msg_len + 3) & ~3)
+
+
+class _SliceU32:
+    """uint32 accessor for buffers that cannot be cast to uint32."""
+
+    __slots__ = ("_buf",)
+
+    def __init__(self, buf: memoryview) -> None:
+        self._buf = buf
+
+    def __getitem__(self, index: int) -> int:
+        pos = index * 4
+        return int.from_bytes(self._buf[pos : pos + 4], "little")
+
+    def __setitem__(self, index: int, value: int) -> None:
+        pos = index * 4
+        self._buf[pos : pos + 4] = value.to_bytes(4, "little")
+
 
-__all__ = ["ByteRingBuffer", "HEADER_SIZE"]
+def _u32_view(buf: memoryview):
+    """Return a uint32 view of ``buf``, indexed in 4-byte words.
 
-HEADER_SIZE: int = 16
-_U32 = struct.Struct("<I")
+    Indexing a cast memoryview is a single C-level load/store with no
+    format parsing or tuple allocation. Non-contiguous views cannot be
+    cast; they fall back to slice-based access.
+    """
+    try:
+        return buf.cast("B").cast("I")
+    except TypeError:
+        return _SliceU32(buf)
 
 
 class ByteRingBuffer:
@@ -35,50 +110,114 @@ class ByteRingBuffer:
     Args:
         buf: Shared memory region as memoryview.
         is_producer: If True, initialize header fields.
+
+    Raises:
+        ValueError: If a consumer finds a header with another layout
+            version, or one written by a FixedSizeRingBuffer.
     """
 
-    __slots__ = ("_buf", "_capacity", "_mask", "_is_producer")
+    __slots__ = (
+        "_hdr",
+        "_data",
+        "_words",
+        "_capacity",
+        "_mask",
+        "_local_head",
+        "_local_tail",
+        "_is_producer",
+    )
 
     def __init__(self, buf: memoryview, *, is_producer: bool = False) -> None:
-        self._buf = buf
+        self._attach(buf, is_producer, 0)
+
+    def _attach(self, buf: memoryview, is_producer: bool, msg_size: int) -> None:
+        """Initialize (producer) or validate (consumer) the header and views."""
+        self._hdr = hdr = _u32_view(buf[:HEADER_SIZE])
         self._is_producer = is_producer
 
         if is_producer:
-            cap = self._round_down_pow2(len(buf) - HEADER_SIZE)
-            _U32.pack_into(self._buf, 0, 0)  # head = 0
-            _U32.pack_into(self._buf, 4, 0)  # tail = 0
-            _U32.pack_into(self._buf, 8, cap)  # capacity
-            _U32.pack_into(self._buf, 12, 0)  # reserved
+            avail = len(buf) - HEADER_SIZE
+            if msg_size:
+                cap = msg_size * self._round_down_pow2(avail // msg_size)
+            else:
+                cap = self._round_down_pow2(avail)
+            buf[:HEADER_SIZE] = bytes(HEADER_SIZE)
+            hdr[_CAP] = cap
+            hdr[_VERSION] = LAYOUT_VERSION
+            hdr[_MSG_SIZE] = msg_size
         else:
-            cap = _U32.unpack_from(self._buf, 8)[0]
+            version = hdr[_VERSION]
+            if version != LAYOUT_VERSION:
+                raise ValueError(
+                    f"ring layout version {version}, expected {LAYOUT_VERSION}"
+                )
+            if hdr[_MSG_SIZE] != msg_size:
+                raise ValueError(
+                    f"ring message size {hdr[_MSG_SIZE]}, expected {msg_size}"
+                )
+            cap = hdr[_CAP]
 
         self._capacity = cap
         self._mask = cap - 1
+        # Data area view, sliced once so the hot path indexes by ring offset
+        self._data = buf[HEADER_SIZE : HEADER_SIZE + cap]
+        # Records are 4-byte aligned, so length prefixes are whole words
+        self._words = _u32_view(self._data)
+        # Only the producer stores head and only the consumer stores tail,
+        # so each side can track its own index without reloading it.
+        self._local_head = hdr[_HEAD]
+        self._local_tail = hdr[_TAIL]
 
     # ---- Producer API ----
 
     def write(self, data: bytes) -> bool:
-        """Write a length-prefixed message: [4B len][payload].
+        """Write a length-prefixed message: [4B len][payload][pad to 4B].
+
+        A record never straddles the end of the data area: if it does not
+        fit before the wrap point, a zero length marker is written there
+        and the record starts again at offset 0. The marker is published
+        on its own, so once the consumer steps over it the space it
+        covered is free again even if the record itself did not fit yet.
 
         Returns:
-            True if written successfully, False if insufficient space.
+            True if written successfully, False if the message is empty,
+            larger than the data area, or there is insufficient space.
         """
         msg_len = len(data)
-        total = msg_len + 4
-        if self.writeable_bytes() < total:
+        if msg_len == 0:
+            return False  # zero length is reserved for the wrap marker
+        total = _record_size(msg_len)
+        capacity = self._capacity
+        if total > capacity:
+            return False
+
+        hdr = self._hdr
+        tail = hdr[_TAIL]
+        head = self._local_head
+        offset = head & self._mask
+        room = capacity - offset
+        if room < total:
+            if capacity - ((head - tail) & _U32_MASK) < room:
+                return False
+            self._words[offset >> 2] = 0
+            head = (head + room) & _U32_MASK
+            hdr[_HEAD] = head
+            self._local_head = head
+            offset = 0
+        if capacity - ((head - tail) & _U32_MASK) < total:
             return False
 
-        head = _U32.unpack_from(self._buf, 0)[0]
-        self._write_raw(head, _U32.pack(msg_len))
-        self._write_raw(head + 4, data)
-        _U32.pack_into(self._buf, 0, head + total)
+        self._words[offset >> 2] = msg_len
+        self._data[offset + 4 : offset + 4 + msg_len] = data
+        head = (head + total) & _U32_MASK
+        hdr[_HEAD] = head
+        self._local_head = head
         return True
 
     def writeable_bytes(self) -> int:
         """Available bytes for writing."""
-        head = _U32.unpack_from(self._buf, 0)[0]
-        tail = _U32.unpack_from(self._buf, 4)[0]
-        return self._capacity - (head - tail)
+        head = self._local_head if self._is_producer else self._hdr[_HEAD]
+        return self._capacity - ((head - self._hdr[_TAIL]) & _U32_MASK)
 
     # ---- Consumer API ----
 
@@ -88,29 +227,115 @@ class ByteRingBuffer:
         Returns:
             Payload bytes, or None if no complete message available.
         """
-        tail = _U32.unpack_from(self._buf, 4)[0]
-        head = _U32.unpack_from(self._buf, 0)[0]
-
-        available = head - tail
-        if available < 4:
+        hdr = self._hdr
+        tail, msg_len = self._next_record(self._local_tail, hdr[_HEAD])
+        if msg_len == 0:
             return None
 
-        msg_len = _U32.unpack(self._read_raw(tail, 4))[0]
-        if msg_len == 0 or available < msg_len + 4:
+        base = (tail & self._mask) + 4
+        payload = bytes(self._data[base : base + msg_len])
+        tail = (tail + _record_size(msg_len)) & _U32_MASK
+        hdr[_TAIL] = tail
+        self._local_tail = tail
+        return payload
+
+    def read_into(self, out) -> int:
+        """Read one length-prefixed message into a caller-provided buffer.
+
+        The payload is copied straight from shared memory into ``out``,
+        with no intermediate bytes object.
+
+        Args:
+            out: Writable C-contiguous buffer (bytearray, memoryview, ndarray).
+
+        Returns:
+            Payload length, or 0 if no complete message is available. As in
+            the C++ Read(), a message larger than ``out`` is skipped and 0
+            is returned.
+        """
+        hdr = self._hdr
+        tail, msg_len = self._next_record(self._local_tail, hdr[_HEAD])
+        if msg_len == 0:
+            return 0
+
+        dst = memoryview(out).cast("B")
+        copied = 0
+        if msg_len <= len(dst):
+            base = (tail & self._mask) + 4
+            dst[:msg_len] = self._data[base : base + msg_len]
+            copied = msg_len
+        tail = (tail + _record_size(msg_len)) & _U32_MASK
+        hdr[_TAIL] = tail
+        self._local_tail = tail
+        return copied
+
+    def read_view(self) -> Optional[Tuple[memoryview, Callable[[], None]]]:
+        """Borrow the next message without copying it out of shared memory.
+
+        Returns ``(payload, release)`` where ``payload`` is a memoryview
+        directly into the data area. The slot stays owned by the consumer
+        until ``release()`` advances tail, so the producer cannot overwrite
+        the payload while it is in use. Calling read_view() again before
+        release() returns the same message.
+
+        Views and anything built on them (e.g. ``np.frombuffer``) must be
+        dropped before the shared memory is closed.
+
+        Returns:
+            ``(payload, release)``, or None if no complete message is available.
+        """
+        hdr = self._hdr
+        tail, msg_len = self._next_record(self._local_tail, hdr[_HEAD])
+        if msg_len == 0:
             return None
 
-        payload = self._read_raw(tail + 4, msg_len)
-        _U32.pack_into(self._buf, 4, tail + msg_len + 4)
-        return payload
+        base = (tail & self._mask) + 4
+        payload = self._data[base : base + msg_len]
+        next_tail = (tail + _record_size(msg_len)) & _U32_MASK
+
+        def release() -> None:
+            hdr[_TAIL] = next_tail
+            self._local_tail = next_tail
+
+        return payload, release
+
+    def read_many(self, max_msgs: int = 64) -> List[bytes]:
+        """Read up to ``max_msgs`` length-prefixed messages in one pass.
+
+        head is loaded once and tail is published once after the batch,
+        so per-message interpreter and header overhead is amortized.
+
+        Returns:
+            List of payloads (empty if no complete message is available).
+        """
+        data_area = self._data
+        hdr = self._hdr
+        mask = self._mask
+        tail = self._local_tail
+        head = hdr[_HEAD]
+
+        out: List[bytes] = []
+        while len(out) < max_msgs:
+            tail, msg_len = self._next_record(tail, head)
+            if msg_len == 0:
+                break
+
+            base = (tail & mask) + 4
+            out.append(bytes(data_area[base : base + msg_len]))
+            tail = (tail + _record_size(msg_len)) & _U32_MASK
+
+        if out:
+            hdr[_TAIL] = tail
+            self._local_tail = tail
+        return out
 
     def readable_bytes(self) -> int:
         """Available bytes for reading."""
-        tail = _U32.unpack_from(self._buf, 4)[0]
-        head = _U32.unpack_from(self._buf, 0)[0]
-        return head - tail
+        tail = self._hdr[_TAIL] if self._is_producer else self._local_tail
+        return (self._hdr[_HEAD] - tail) & _U32_MASK
 
     def has_data(self) -> bool:
-        """Check if at least one complete message header is available."""
+        """Check if a message (or a pending wrap marker) is available."""
         return self.readable_bytes() >= 4
 
     @property
@@ -120,39 +345,208 @@ class ByteRingBuffer:
 
     # ---- Internal ----
 
-    def _write_raw(self, pos: int, data: bytes) -> None:
-        length = len(data)
-        offset = pos & self._mask
-        base = HEADER_SIZE + offset
-        first = self._capacity - offset
-
-        if first >= length:
-            self._buf[base : base + length] = data
-        else:
-            self._buf[base : base + first] = data[:first]
-            self._buf[HEADER_SIZE : HEADER_SIZE + length - first] = data[first:]
+    def _next_record(self, tail: int, head: int) -> Tuple[int, int]:
+        """Locate the next complete record at or after ``tail``.
 
-    def _read_raw(self, pos: int, length: int) -> bytes:
-        offset = pos & self._mask
-        base = HEADER_SIZE + offset
-        first = self._capacity - offset
+        Steps over a wrap marker if there is one and publishes tail past
+        it right away, so the producer can reuse that space even when no
+        record follows the marker yet.
 
-        if first >= length:
-            return bytes(self._buf[base : base + length])
-        return bytes(self._buf[base : base + first]) + bytes(
-            self._buf[HEADER_SIZE : HEADER_SIZE + length - first]
-        )
+        Returns:
+            ``(record_pos, msg_len)``; msg_len is 0 if no complete record.
+        """
+        available = (head - tail) & _U32_MASK
+        if available < 4:
+            return tail, 0
+
+        offset = tail & self._mask
+        msg_len = self._words[offset >> 2]
+        if msg_len == 0:
+            # Wrap marker: the record continues at offset 0
+            skip = self._capacity - offset
+            if available < skip:
+                return tail, 0
+            tail = (tail + skip) & _U32_MASK
+            self._hdr[_TAIL] = tail
+            self._local_tail = tail
+            available -= skip
+            if available < 4:
+                return tail, 0
+            msg_len = self._words[0]
+
+        if available < _record_size(msg_len):
+            return tail, 0
+        return tail, msg_len
 
     @staticmethod
     def _round_down_pow2(v: int) -> int:
-        if v <= 0:
+        return 0 if v <= 0 else 1 << (v.bit_length() - 1)
+
+
+class FixedSizeRingBuffer(ByteRingBuffer):
+    """SPSC ring of fixed-size messages, without length prefixes.
+
+    The data area holds a power-of-two number of ``msg_size`` slots and
+    head/tail count messages, so a message is located by its index alone
+    and no per-message length is stored, loaded or parsed.
+
+    Args:
+        buf: Shared memory region as memoryview.
+        msg_size: Size in bytes of every message.
+        is_producer: If True, initialize header fields.
+
+    Raises:
+        ValueError: If ``msg_size`` is not positive, or a consumer finds a
+            header with another layout version or message size.
+    """
+
+    __slots__ = ("_msg_size", "_slot_mask")
+
+    def __init__(
+        self, buf: memoryview, msg_size: int, *, is_producer: bool = False
+    ) -> None:
+        if msg_size <= 0:
+            raise ValueError(f"msg_size must be positive, got {msg_size}")
+        self._msg_size = msg_size
+        self._attach(buf, is_producer, msg_size)
+        self._slot_mask = self._capacity // msg_size - 1
+
+    # ---- Producer API ----
+
+    def write(self, data: bytes) -> bool:
+        """Write one message into the next slot.
+
+        Returns:
+            True if written successfully, False if ``data`` is not exactly
+            ``msg_size`` bytes or every slot is in use.
+        """
+        size = self._msg_size
+        if len(data) != size:
+            return False
+        hdr = self._hdr
+        head = self._local_head
+        if ((head - hdr[_TAIL]) & _U32_MASK) > self._slot_mask:
+            return False
+
+        offset = (head & self._slot_mask) * size
+        self._data[offset : offset + size] = data
+        head = (head + 1) & _U32_MASK
+        hdr[_HEAD] = head
+        self._local_head = head
+        return True
+
+    def writeable_bytes(self) -> int:
+        """Available bytes for writing (a multiple of ``msg_size``)."""
+        head = self._local_head if self._is_producer else self._hdr[_HEAD]
+        used = (head - self._hdr[_TAIL]) & _U32_MASK
+        return (self._slot_mask + 1 - used) * self._msg_size
+
+    # ---- Consumer API ----
+
+    def read(self) -> Optional[bytes]:
+        """Read one message.
+
+        Returns:
+            Payload bytes, or None if no message is available.
+        """
+        hdr = self._hdr
+        tail = self._local_tail
+        if tail == hdr[_HEAD]:
+            return None
+
+        size = self._msg_size
+        offset = (tail & self._slot_mask) * size
+        payload = bytes(self._data[offset : offset + size])
+        tail = (tail + 1) & _U32_MASK
+        hdr[_TAIL] = tail
+        self._local_tail = tail
+        return payload
+
+    def read_into(self, out) -> int:
+        """Read one message into a caller-provided buffer.
+
+        Returns:
+            ``msg_size``, or 0 if no message is available. A message larger
+            than ``out`` is skipped and 0 is returned.
+        """
+        hdr = self._hdr
+        tail = self._local_tail
+        if tail == hdr[_HEAD]:
             return 0
-        v |= v >> 1
-        v |= v >> 2
-        v |= v >> 4
-        v |= v >> 8
-        v |= v >> 16
-        return (v >> 1) + 1
+
+        size = self._msg_size
+        dst = memoryview(out).cast("B")
+        copied = 0
+        if size <= len(dst):
+            offset = (tail & self._slot_mask) * size
+            dst[:size] = self._data[offset : offset + size]
+            copied = size
+        tail = (tail + 1) & _U32_MASK
+        hdr[_TAIL] = tail
+        self._local_tail = tail
+        return copied
+
+    def read_view(self) -> Optional[Tuple[memoryview, Callable[[], None]]]:
+        """Borrow the next message without copying it, see ByteRingBuffer.read_view.
+
+        Returns:
+            ``(payload, release)``, or None if no message is available.
+        """
+        hdr = self._hdr
+        tail = self._local_tail
+        if tail == hdr[_HEAD]:
+            return None
+
+        size = self._msg_size
+        offset = (tail & self._slot_mask) * size
+        payload = self._data[offset : offset + size]
+        next_tail = (tail + 1) & _U32_MASK
+
+        def release() -> None:
+            hdr[_TAIL] = next_tail
+            self._local_tail = next_tail
+
+        return payload, release
+
+    def read_many(self, max_msgs: int = 64) -> List[bytes]:
+        """Read up to ``max_msgs`` messages, publishing tail once.
+
+        Returns:
+            List of payloads (empty if no message is available).
+        """
+        hdr = self._hdr
+        tail = self._local_tail
+        count = min((hdr[_HEAD] - tail) & _U32_MASK, max_msgs)
+        if count <= 0:
+            return []
+
+        data_area = self._data
+        size = self._msg_size
+        slot_mask = self._slot_mask
+        out: List[bytes] = []
+        for i in range(count):
+            offset = ((tail + i) & slot_mask) * size
+            out.append(bytes(data_area[offset : offset + size]))
+
+        tail = (tail + count) & _U32_MASK
+        hdr[_TAIL] = tail
+        self._local_tail = tail
+        return out
+
+    def readable_bytes(self) -> int:
+        """Available bytes for reading (a multiple of ``msg_size``)."""
+        tail = self._hdr[_TAIL] if self._is_producer else self._local_tail
+        return ((self._hdr[_HEAD] - tail) & _U32_MASK) * self._msg_size
+
+    def has_data(self) -> bool:
+        """Check if at least one message is available."""
+        tail = self._hdr[_TAIL] if self._is_producer else self._local_tail
+        return self._hdr[_HEAD] != tail
+
+    @property
+    def msg_size(self) -> int:
+        """Size in bytes of every message."""
+        return self._msg_size
 
 
 def _run_tests() -> None:
@@ -171,7 +565,7 @@ def _run_tests() -> None:
             print(f"  FAIL: {name} (got {got!r}, expected {expected!r})")
 
     # Test 1: basic write/read
-    buf = bytearray(16 + 64)
+    buf = bytearray(HEADER_SIZE + 64)
     ring = ByteRingBuffer(memoryview(buf), is_producer=True)
     check("capacity", ring.capacity, 64)
     check("initial readable", ring.readable_bytes(), 0)
@@ -179,7 +573,7 @@ def _run_tests() -> None:
 
     ok = ring.write(b"hello")
     check("write ok", ok, True)
-    check("readable after write", ring.readable_bytes(), 9)
+    check("readable after write", ring.readable_bytes(), 12)
 
     data = ring.read()
     check("read data", data, b"hello")
@@ -195,27 +589,210 @@ def _run_tests() -> None:
     check("empty after all", ring2.read(), None)
 
     # Test 3: wrap-around
-    buf3 = bytearray(16 + 32)
+    buf3 = bytearray(HEADER_SIZE + 32)
     ring3 = ByteRingBuffer(memoryview(buf3), is_producer=True)
     ring3.write(b"A" * 20)
     ring3.read()
     check("wrap write", ring3.write(b"B" * 20), True)
     check("wrap read", ring3.read(), b"B" * 20)
+    ring3.write(bytearray(b"E" * 20))
+    check("wrap bytearray read", ring3.read(), b"E" * 20)
+
+    # Test 3b: wrap marker layout, record placed contiguously at offset 0
+    ring3b = ByteRingBuffer(memoryview(buf3), is_producer=True)
+    ring3b.write(b"C" * 18)  # 4 + 20 bytes
+    ring3b.read()
+    check("wrap marker write", ring3b.write(b"D" * 10), True)
+    data3 = memoryview(buf3)[HEADER_SIZE:]
+    check("wrap marker", bytes(data3[24:28]), b"\x00" * 4)
+    check("wrap record", bytes(data3[4:14]), b"D" * 10)
+    check("wrap readable", ring3b.readable_bytes(), 8 + 16)
+    check("wrap marker read", ring3b.read(), b"D" * 10)
+    check("wrap too large", ring3b.write(b"F" * 29), False)
+    check("reject empty", ring3b.write(b""), False)
+
+    # Test 3c: a record larger than the space before the wrap point on an
+    # empty ring: the marker is published alone, then the record fits
+    buf3c = bytearray(HEADER_SIZE + 32)
+    ring3c = ByteRingBuffer(memoryview(buf3c), is_producer=True)
+    ring3c.write(b"G" * 12)  # 16-byte record
+    ring3c.read()
+    check("marker alone writeable", ring3c.writeable_bytes(), 32)
+    check("marker alone write", ring3c.write(b"H" * 20), False)
+    check("marker alone readable", ring3c.readable_bytes(), 16)
+    check("marker alone read", ring3c.read(), None)
+    check("marker consumed", ring3c.readable_bytes(), 0)
+    check("after marker write", ring3c.write(b"H" * 20), True)
+    check("after marker read", ring3c.read(), b"H" * 20)
+    check("reject larger than capacity", ring3c.write(b"I" * 29), False)
 
     # Test 4: full buffer rejection
-    buf4 = bytearray(16 + 16)
+    buf4 = bytearray(HEADER_SIZE + 16)
     ring4 = ByteRingBuffer(memoryview(buf4), is_producer=True)
     check("full write", ring4.write(b"X" * 12), True)
     check("reject on full", ring4.write(b"Y"), False)
 
     # Test 5: consumer view
-    buf5 = bytearray(16 + 64)
+    buf5 = bytearray(HEADER_SIZE + 64)
     prod = ByteRingBuffer(memoryview(buf5), is_producer=True)
     prod.write(b"cross-lang")
     cons = ByteRingBuffer(memoryview(buf5), is_producer=False)
     check("consumer capacity", cons.capacity, 64)
     check("consumer has_data", cons.has_data(), True)
     check("consumer read", cons.read(), b"cross-lang")
+    check("consumer writeable", cons.writeable_bytes(), 64)
+    prod.write(b"again")
+    check("consumer writeable after write", cons.writeable_bytes(), 64 - 12)
+    check("producer readable", prod.readable_bytes(), 12)
+    cons.read()
+    check("producer readable after read", (prod.readable_bytes(), prod.has_data()), (0, False))
+
+    # Test 5b: batched read
+    buf5b = bytearray(HEADER_SIZE + 64)
+    ring5b = ByteRingBuffer(memoryview(buf5b), is_producer=True)
+    for m in (b"a", b"bb", b"ccc"):
+        ring5b.write(m)
+    check("read_many limit", ring5b.read_many(2), [b"a", b"bb"])
+    check("read_many rest", ring5b.read_many(), [b"ccc"])
+    check("read_many empty", ring5b.read_many(), [])
+    check("read_many drained", ring5b.readable_bytes(), 0)
+    ring5b.write(b"E" * 28)
+    ring5b.write(b"D" * 10)  # wraps
+    check("read_many wrap", ring5b.read_many(), [b"E" * 28, b"D" * 10])
+
+    # Test 5c: read into a caller buffer
+    buf5c = bytearray(HEADER_SIZE + 32)
+    ring5c = ByteRingBuffer(memoryview(buf5c), is_producer=True)
+    out = bytearray(20)
+    check("read_into empty", ring5c.read_into(out), 0)
+    ring5c.write(b"A" * 20)
+    check("read_into len", ring5c.read_into(out), 20)
+    check("read_into data", bytes(out[:20]), b"A" * 20)
+    ring5c.write(b"B" * 20)  # wraps
+    check("read_into wrap len", ring5c.read_into(out), 20)
+    check("read_into wrap data", bytes(out[:20]), b"B" * 20)
+    ring5c.write(b"C" * 20)
+    check("read_into too large", ring5c.read_into(bytearray(16)), 0)
+    check("read_into skipped", ring5c.readable_bytes(), 0)
+
+    # Test 5d: borrowed view
+    buf5d = bytearray(HEADER_SIZE + 32)
+    ring5d = ByteRingBuffer(memoryview(buf5d), is_producer=True)
+    check("read_view empty", ring5d.read_view(), None)
+    ring5d.write(b"A" * 20)
+    view, release = ring5d.read_view()
+    check("read_view data", bytes(view), b"A" * 20)
+    check("read_view zero-copy", view.obj is buf5d, True)
+    check("read_view held", ring5d.writeable_bytes(), 8)
+    release()
+    check("read_view released", ring5d.readable_bytes(), 0)
+    ring5d.write(b"B" * 20)  # wraps
+    view, release = ring5d.read_view()
+    check("read_view wrap data", bytes(view), b"B" * 20)
+    check("read_view wrap zero-copy", view.obj is buf5d, True)
+    release()
+    check("read_view wrap released", ring5d.readable_bytes(), 0)
+
+    # Test 5e: header layout and version check
+    buf5e = bytearray(HEADER_SIZE + 64)
+    ByteRingBuffer(memoryview(buf5e), is_producer=True).write(b"x")
+    check("head offset", buf5e[0:4], b"\x08\x00\x00\x00")
+    check("tail offset", buf5e[64:68], b"\x00\x00\x00\x00")
+    check("capacity offset", buf5e[128:132], b"\x40\x00\x00\x00")
+    check("version offset", buf5e[132:136], b"\x02\x00\x00\x00")
+    buf5e[132:136] = bytes(4)
+    try:
+        ByteRingBuffer(memoryview(buf5e), is_producer=False)
+        check("reject old layout", False, True)
+    except ValueError:
+        check("reject old layout", True, True)
+
+    # Test 6: head/tail wrap past 2^32
+    buf6 = bytearray(HEADER_SIZE + 64)
+    ring6 = ByteRingBuffer(memoryview(buf6), is_producer=True)
+    ring6._hdr[_HEAD] = ring6._hdr[_TAIL] = 0xFFFFFFF8
+    ring6._local_head = ring6._local_tail = 0xFFFFFFF8
+    check("u32 wrap write", ring6.write(b"wrap"), True)
+    check("u32 wrap readable", ring6.readable_bytes(), 8)
+    check("u32 wrap writeable", ring6.writeable_bytes(), 56)
+    check("u32 wrap read", ring6.read(), b"wrap")
+
+    # Test 6b: _round_down_pow2 matches the C++ bit-smear fold
+    def fold(v: int) -> int:
+        if v == 0:
+            return 0
+        v |= v >> 1
+        v |= v >> 2
+        v |= v >> 4
+        v |= v >> 8
+        v |= v >> 16
+        return (v >> 1) + 1
+
+    samples = set(range(4097))
+    for k in range(32):
+        samples.update(((1 << k) - 1, 1 << k, (1 << k) + 1))
+    samples.add(0xFFFFFFFF)
+    mismatches = [v for v in samples if ByteRingBuffer._round_down_pow2(v) != fold(v)]
+    check("round_down_pow2", mismatches, [])
+    check("round_down_pow2 negative", ByteRingBuffer._round_down_pow2(-1), 0)
+
+    # Test 7: uint32 fallback for a non-contiguous view
+    buf7 = bytearray(2 * (HEADER_SIZE + 64))
+    ring7 = ByteRingBuffer(memoryview(buf7)[::2], is_producer=True)
+    check("strided capacity", ring7.capacity, 64)
+    check("strided header", buf7[256:258], b"\x40\x00")
+    check("strided readable", ring7.readable_bytes(), 0)
+    check("strided write", ring7.write(b"hello"), True)
+    check("strided length prefix", buf7[2 * HEADER_SIZE : 2 * HEADER_SIZE + 8 : 2], b"\x05\x00\x00\x00")
+    check("strided read", ring7.read(), b"hello")
+
+    # Test 8: fixed-size messages
+    buf8 = bytearray(HEADER_SIZE + 100)
+    ring8 = FixedSizeRingBuffer(memoryview(buf8), 12, is_producer=True)
+    check("fixed capacity", ring8.capacity, 96)  # 8 slots of 12
+    check("fixed msg_size offset", buf8[136:140], b"\x0c\x00\x00\x00")
+    check("fixed reject size", ring8.write(b"short"), False)
+    for i in range(8):
+        check(f"fixed write {i}", ring8.write(bytes([i]) * 12), True)
+    check("fixed full", ring8.write(b"x" * 12), False)
+    check("fixed readable", ring8.readable_bytes(), 96)
+    check("fixed no prefix", bytes(buf8[HEADER_SIZE : HEADER_SIZE + 12]), b"\x00" * 12)
+
+    cons8 = FixedSizeRingBuffer(memoryview(buf8), 12)
+    check("fixed read", cons8.read(), b"\x00" * 12)
+    out8 = bytearray(12)
+    check("fixed read_into", cons8.read_into(out8), 12)
+    check("fixed read_into data", out8, bytearray(b"\x01" * 12))
+    view8, release8 = cons8.read_view()
+    check("fixed read_view", bytes(view8), b"\x02" * 12)
+    view8.release()
+    release8()
+    check("fixed read_many", cons8.read_many(3), [b"\x03" * 12, b"\x04" * 12, b"\x05" * 12])
+    check("fixed skip small out", cons8.read_into(bytearray(4)), 0)
+    check("fixed writeable", ring8.writeable_bytes(), 84)
+    check("fixed read_many rest", len(cons8.read_many()), 1)
+    check("fixed empty", (cons8.has_data(), cons8.read()), (False, None))
+    check("fixed producer has_data", ring8.has_data(), False)
+    check("fixed consumer writeable", cons8.writeable_bytes(), 96)
+
+    ring8._hdr[_HEAD] = ring8._hdr[_TAIL] = 0xFFFFFFFE
+    ring8._local_head = cons8._local_tail = 0xFFFFFFFE
+    for i in range(4):
+        ring8.write(bytes([0x10 + i]) * 12)
+    check("fixed u32 head", ring8._hdr[_HEAD], 2)
+    check("fixed u32 read", cons8.read_many(), [bytes([0x10 + i]) * 12 for i in range(4)])
+
+    for name, make in (
+        ("fixed reject msg_size", lambda: FixedSizeRingBuffer(memoryview(buf8), 16)),
+        ("byte ring reject fixed", lambda: ByteRingBuffer(memoryview(buf8))),
+        ("fixed reject byte ring", lambda: FixedSizeRingBuffer(memoryview(buf), 12)),
+        ("fixed reject zero size", lambda: FixedSizeRingBuffer(memoryview(buf8), 0)),
+    ):
+        try:
+            make()
+            check(name, False, True)
+        except ValueError:
+            check(name, True, True)
 
     print(f"Results: {passed} passed, {failed} failed")
     sys.exit(1 if failed > 0 else 0)
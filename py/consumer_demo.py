@@ -8,6 +8,7 @@ Requires: numpy, opencv-python
     pip install numpy opencv-python
 """
 
+import struct
 import sys
 import time
 
@@ -21,6 +22,8 @@ HEIGHT = 1080
 CHANNELS = 3
 FRAME_SIZE = WIDTH * HEIGHT * CHANNELS
 
+_U32 = struct.Struct("<I")  # frame index (first 4 bytes, LE)
+
 
 def main():
     shm_name = sys.argv[1] if len(sys.argv) > 1 else "shm_video"
@@ -41,28 +44,41 @@ def main():
         print("OpenCV not available, printing frame info only")
 
     while True:
-        if not consumer.has_data():
-            time.sleep(0.001)
-            continue
-
-        data = consumer.read()
-        if data is None or len(data) != FRAME_SIZE:
+        item = consumer.read_view()
+        if item is None:
+            consumer.wait(0.001)
             continue
 
-        frame_count += 1
-
-        if has_cv2:
-            img = np.frombuffer(data, dtype=np.uint8).reshape((HEIGHT, WIDTH, CHANNELS))
-            cv2.imshow("SHM Consumer", img)
-            if (cv2.waitKey(1) & 0xFF) == ord("q"):
-                break
-        else:
-            # No OpenCV: just print stats
-            frame_idx = int.from_bytes(data[:4], byteorder="little")
-            if frame_count % 100 == 0:
-                elapsed = time.monotonic() - t0
-                fps = frame_count / elapsed if elapsed > 0 else 0
-                print(f"Frame #{frame_idx}, total: {frame_count}, FPS: {fps:.1f}")
+        # Borrowed view into shared memory: no copy until OpenCV's own.
+        # The producer cannot reuse the slot until release().
+        view, release = item
+        frame = None
+        try:
+            if len(view) != FRAME_SIZE:
+                continue
+
+            frame_count += 1
+
+            if has_cv2:
+                frame = np.frombuffer(view, dtype=np.uint8).reshape(
+                    (HEIGHT, WIDTH, CHANNELS)
+                )
+                cv2.imshow("SHM Consumer", frame)
+                if (cv2.waitKey(1) & 0xFF) == ord("q"):
+                    break
+            else:
+                # No OpenCV: just print stats
+                frame_idx = _U32.unpack_from(view, 0)[0]
+                if frame_count % 100 == 0:
+                    elapsed = time.monotonic() - t0
+                    fps = frame_count / elapsed if elapsed > 0 else 0
+                    print(f"Frame #{frame_idx}, total: {frame_count}, FPS: {fps:.1f}")
+        finally:
+            # The array must go before the view, or release() raises
+            # BufferError and hides whatever exception got us here.
+            frame = None
+            view.release()
+            release()
 
     consumer.close()
     print(f"Total frames received: {frame_count}")
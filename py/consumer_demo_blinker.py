@@ -5,28 +5,37 @@ Usage:
     pip install blinker numpy opencv-python
     python consumer_demo_blinker.py [shm_name]
 
-Architecture:
+Architecture (USE_BLINKER = True):
     ShmReader → frame_received → FrameDecoder → frame_decoded → FrameDisplay
                                                               ↓
                                                          FPSCounter
+
+Default (USE_BLINKER = False): the per-frame path is a fixed chain of direct
+calls, ShmReader → FramePipeline → decoder → display → FPS counter; Blinker
+signals are only used for errors and FPS reports.
 """
 
+import struct
 import sys
 import time
 from typing import Optional
 
 import numpy as np
-from blinker import signal
+from blinker import Namespace
 
 sys.path.insert(0, ".")
 from shm_channel import ShmConsumer
 
-# 定义信号
-frame_received = signal("frame.received")
-frame_decoded = signal("frame.decoded")
-frame_displayed = signal("frame.displayed")
-fps_updated = signal("fps.updated")
-error_occurred = signal("error.occurred")
+# 定义信号；各组件默认使用 event_bus，传入独立的 Namespace 即可隔离（如测试）
+event_bus = Namespace()
+frame_received = event_bus.signal("frame.received")
+frame_decoded = event_bus.signal("frame.decoded")
+frame_displayed = event_bus.signal("frame.displayed")
+fps_updated = event_bus.signal("fps.updated")
+error_occurred = event_bus.signal("error.occurred")
+
+# 为 True 时帧沿 Blinker 信号链分发；否则走 FramePipeline 直接调用
+USE_BLINKER = False
 
 # 常量
 WIDTH = 1920
@@ -34,27 +43,76 @@ HEIGHT = 1080
 CHANNELS = 3
 FRAME_SIZE = WIDTH * HEIGHT * CHANNELS
 
+_U32 = struct.Struct("<I")  # 帧索引 (前 4 字节, LE)
+
 
 class ShmReader:
     """负责从共享内存读取原始数据"""
 
-    def __init__(self, shm_name: str):
+    def __init__(
+        self,
+        shm_name: str,
+        frame_buffer: Optional[bytearray] = None,
+        pipeline: Optional["FramePipeline"] = None,
+        ns: Optional[Namespace] = None,
+    ):
+        ns = event_bus if ns is None else ns
+        self._frame_received = ns.signal("frame.received")
+        self._error_occurred = ns.signal("error.occurred")
         self.consumer = ShmConsumer(shm_name)
+        # 预分配的帧缓冲区（通常为 FrameDecoder.buffer），设置后帧直接拷入其中
+        self.frame_buffer = frame_buffer
+        # 设置后帧直接交给 pipeline，不再发送 frame_received 信号
+        self.pipeline = pipeline
         print(f"Connected to {shm_name} (capacity: {self.consumer.capacity} bytes)")
 
-    def poll(self) -> bool:
-        """轮询共享内存，有数据时发送 frame_received 信号"""
-        if not self.consumer.has_data():
-            return False
+    def poll(self, max_frames: int = 4) -> bool:
+        """轮询共享内存，一次取出最多 max_frames 帧，逐帧发送 frame_received 信号"""
+        if self.frame_buffer is not None:
+            return self._poll_into(max_frames)
 
-        data = self.consumer.read()
-        if data is None or len(data) != FRAME_SIZE:
-            error_occurred.send(self, error="Invalid frame size")
+        frames = self.consumer.read_many(max_frames)
+        if not frames:
             return False
 
-        frame_received.send(self, data=data)
+        for data in frames:
+            if len(data) != FRAME_SIZE:
+                self._error_occurred.send(self, error="Invalid frame size")
+                continue
+            self._dispatch(data)
         return True
 
+    def _poll_into(self, max_frames: int) -> bool:
+        """逐帧读入 frame_buffer 并同步分发，接收者须在返回前处理完该帧"""
+        received = False
+        for _ in range(max_frames):
+            # 借用共享内存中的帧：可区分"无数据"和"帧大小不符"，合法帧只拷贝一次
+            item = self.consumer.read_view()
+            if item is None:
+                break
+            view, release = item
+            received = True
+            valid = len(view) == FRAME_SIZE
+            if valid:
+                self.frame_buffer[:] = view
+            view.release()
+            release()
+            if not valid:
+                self._error_occurred.send(self, error="Invalid frame size")
+                continue
+            self._dispatch(self.frame_buffer)
+        return received
+
+    def _dispatch(self, data):
+        if self.pipeline is not None:
+            self.pipeline.on_frame(data)
+        else:
+            self._frame_received.send(self, data=data)
+
+    def wait(self, timeout: float) -> bool:
+        """等待新数据（生产者开启通知时阻塞在 FIFO 上，否则休眠 timeout）"""
+        return self.consumer.wait(timeout)
+
     def close(self):
         self.consumer.close()
 
@@ -62,32 +120,46 @@ class ShmReader:
 class FrameDecoder:
     """负责解码原始字节为 numpy 数组"""
 
-    def __init__(self):
-        frame_received.connect(self.decode)
+    def __init__(self, ns: Optional[Namespace] = None):
+        ns = event_bus if ns is None else ns
+        self._frame_decoded = ns.signal("frame.decoded")
+        self._error_occurred = ns.signal("error.occurred")
+        # 复用的帧缓冲区及其 ndarray 视图，避免每帧创建数组
+        self.buffer = bytearray(FRAME_SIZE)
+        self._frame = np.frombuffer(self.buffer, dtype=np.uint8).reshape(
+            (HEIGHT, WIDTH, CHANNELS)
+        )
+        ns.signal("frame.received").connect(self.decode)
 
     def decode(self, sender, data: bytes):
         """解码帧数据"""
         try:
-            frame = np.frombuffer(data, dtype=np.uint8).reshape(
-                (HEIGHT, WIDTH, CHANNELS)
-            )
-            frame_decoded.send(self, frame=frame, frame_idx=self._extract_frame_idx(data))
+            frame = self.to_frame(data)
+            self._frame_decoded.send(self, frame=frame, frame_idx=self._extract_frame_idx(data))
         except Exception as e:
-            error_occurred.send(self, error=f"Decode failed: {e}")
+            self._error_occurred.send(self, error=f"Decode failed: {e}")
+
+    def to_frame(self, data) -> np.ndarray:
+        """字节转为 (HEIGHT, WIDTH, CHANNELS) 数组，data 为 self.buffer 时复用预分配的数组"""
+        if data is self.buffer:
+            return self._frame
+        return np.frombuffer(data, dtype=np.uint8).reshape((HEIGHT, WIDTH, CHANNELS))
 
     @staticmethod
     def _extract_frame_idx(data: bytes) -> int:
         """从帧数据中提取帧索引（假设前 4 字节是帧索引）"""
-        return int.from_bytes(data[:4], byteorder="little")
+        return _U32.unpack_from(data, 0)[0]
 
 
 class FrameDisplay:
     """负责显示帧（如果有 OpenCV）"""
 
-    def __init__(self):
+    def __init__(self, ns: Optional[Namespace] = None):
+        ns = event_bus if ns is None else ns
+        self._frame_displayed = ns.signal("frame.displayed")
         self.has_cv2 = self._check_opencv()
         if self.has_cv2:
-            frame_decoded.connect(self.display)
+            ns.signal("frame.decoded").connect(self.display)
         else:
             print("OpenCV not available, display disabled")
 
@@ -102,37 +174,80 @@ class FrameDisplay:
 
     def display(self, sender, frame: np.ndarray, frame_idx: int):
         """显示帧"""
+        self.show(frame)
+        self._frame_displayed.send(self, frame_idx=frame_idx)
+
+    def show(self, frame: np.ndarray):
+        """调用 OpenCV 显示帧，按 'q' 退出"""
         import cv2
 
         cv2.imshow("SHM Consumer (Blinker)", frame)
         if (cv2.waitKey(1) & 0xFF) == ord("q"):
             raise KeyboardInterrupt("User pressed 'q'")
-        frame_displayed.send(self, frame_idx=frame_idx)
 
 
 class FPSCounter:
     """FPS 统计"""
 
-    def __init__(self, report_interval: int = 100):
+    def __init__(self, report_interval: int = 100, ns: Optional[Namespace] = None):
+        ns = event_bus if ns is None else ns
+        self._fps_updated = ns.signal("fps.updated")
         self.count = 0
-        self.start_time = time.monotonic()
+        self.start_time = time.monotonic_ns()
         self.report_interval = report_interval
-        frame_displayed.connect(self.on_frame)
+        ns.signal("frame.displayed").connect(self.on_frame)
 
     def on_frame(self, sender, frame_idx: int):
+        self.tick(frame_idx)
+
+    def tick(self, frame_idx: int):
+        """计数一帧，每 report_interval 帧报告一次 FPS（仅在报告时取时间并做除法）"""
         self.count += 1
         if self.count % self.report_interval == 0:
-            elapsed = time.monotonic() - self.start_time
-            fps = self.count / elapsed if elapsed > 0 else 0
-            fps_updated.send(self, fps=fps, total_frames=self.count)
+            elapsed_ns = time.monotonic_ns() - self.start_time
+            fps = self.count * 1_000_000_000 / elapsed_ns if elapsed_ns > 0 else 0
+            self._fps_updated.send(self, fps=fps, total_frames=self.count)
             print(f"Frame #{frame_idx}, Total: {self.count}, FPS: {fps:.1f}")
 
 
+class FramePipeline:
+    """固定的帧处理链：解码 → 显示 → FPS 统计，组件间直接调用
+
+    每帧省去 Blinker 的接收者遍历和 kwargs 构造；错误仍通过 error_occurred 信号上报。
+    与信号链一致，没有 OpenCV 时不显示也不计数。
+    """
+
+    def __init__(
+        self,
+        decoder: FrameDecoder,
+        display: FrameDisplay,
+        fps: FPSCounter,
+        ns: Optional[Namespace] = None,
+    ):
+        ns = event_bus if ns is None else ns
+        self._error_occurred = ns.signal("error.occurred")
+        self._decoder = decoder
+        self._display = display if display.has_cv2 else None
+        self._fps = fps
+
+    def on_frame(self, data):
+        try:
+            frame = self._decoder.to_frame(data)
+        except Exception as e:
+            self._error_occurred.send(self, error=f"Decode failed: {e}")
+            return
+
+        if self._display is not None:
+            self._display.show(frame)
+            self._fps.tick(FrameDecoder._extract_frame_idx(data))
+
+
 class ErrorLogger:
     """错误日志"""
 
-    def __init__(self):
-        error_occurred.connect(self.log_error)
+    def __init__(self, ns: Optional[Namespace] = None):
+        ns = event_bus if ns is None else ns
+        ns.signal("error.occurred").connect(self.log_error)
 
     def log_error(self, sender, error: str):
         print(f"[ERROR] {error}")
@@ -141,19 +256,21 @@ class ErrorLogger:
 def main():
     shm_name = sys.argv[1] if len(sys.argv) > 1 else "shm_video"
 
-    # 初始化所有组件（事件驱动）
-    reader = ShmReader(shm_name)
+    # 初始化所有组件，帧直接读入解码器的缓冲区
     decoder = FrameDecoder()
     display = FrameDisplay()
     fps_counter = FPSCounter(report_interval=100)
     error_logger = ErrorLogger()
+    pipeline = None if USE_BLINKER else FramePipeline(decoder, display, fps_counter)
+    reader = ShmReader(shm_name, frame_buffer=decoder.buffer, pipeline=pipeline)
 
-    print("Event-driven consumer started. Press 'q' to quit.")
+    mode = "Event-driven" if USE_BLINKER else "Pipeline"
+    print(f"{mode} consumer started. Press 'q' to quit.")
 
     try:
         while True:
             if not reader.poll():
-                time.sleep(0.001)  # 无数据时短暂休眠
+                reader.wait(0.001)  # 无数据时等待生产者通知
     except KeyboardInterrupt:
         print("\nShutting down...")
     finally:
@@ -9,17 +9,198 @@ Usage:
     # Consumer (C++ or Python)
     consumer = ShmConsumer("my_channel")
     data = consumer.read()
+
+Wakeups:
+    A Python producer created with ``notify=True`` writes one byte to a
+    named FIFO after each message. ``ShmConsumer.wait()`` blocks on that
+    FIFO instead of sleeping, so the consumer wakes as soon as data lands.
+    Without a notifying producer (e.g. the C++ one, or on Windows) wait()
+    falls back to a plain timed sleep. Either way it first spins briefly,
+    yielding the CPU between polls, to catch data that is about to land.
+
+Huge pages:
+    On Linux, ``ShmProducer(..., huge_pages=True)`` with a capacity of at
+    least 2 MiB backs the channel with a file on hugetlbfs
+    (``/dev/hugepages/<name>``), so a multi-megabyte frame spans a few TLB
+    entries instead of ~1500. ShmConsumer opens regular shared memory
+    first and only falls back to that path when no regular segment of
+    the name exists, so a file left behind by an earlier producer never
+    shadows a live segment. If huge pages are unavailable (not mounted,
+    none reserved in vm.nr_hugepages, no permission) the producer
+    silently falls back to regular shared memory. The C++ side only uses
+    regular shared memory. Like a regular segment, the file (and its
+    reserved huge pages) persists until ShmProducer.destroy().
 """
 
 from __future__ import annotations
 
+import mmap
+import os
+import select
+import stat
+import sys
+import tempfile
+import time
 from multiprocessing.shared_memory import SharedMemory
-from typing import Optional
+from typing import Callable, List, Optional, Tuple, Union
 
-from byte_ring_buffer import ByteRingBuffer, HEADER_SIZE
+from byte_ring_buffer import ByteRingBuffer, FixedSizeRingBuffer, HEADER_SIZE
 
 __all__ = ["ShmProducer", "ShmConsumer"]
 
+# Polls wait() makes, yielding between each, before it blocks or sleeps.
+_SPIN_ROUNDS: int = 16
+
+_HUGEPAGE_DIR = "/dev/hugepages"
+_HUGEPAGE_SIZE = 2 << 20
+
+if hasattr(os, "sched_yield"):
+    _pause: Callable[[], None] = os.sched_yield
+else:
+    def _pause() -> None:
+        time.sleep(0)
+
+
+class _HugePageMemory:
+    """Shared memory segment backed by a hugetlbfs file (Linux only).
+
+    Provides the subset of the SharedMemory interface the channel uses:
+    ``buf``, ``size``, ``close()`` and ``unlink()``.
+
+    Raises:
+        OSError: If the file cannot be created, sized or mapped, e.g. when
+            no huge pages are reserved.
+    """
+
+    __slots__ = ("_path", "_mmap", "_buf")
+
+    def __init__(self, name: str, create: bool = False, size: int = 0) -> None:
+        self._path = _hugepage_path(name)
+        flags = os.O_RDWR | (os.O_CREAT | os.O_EXCL if create else 0)
+        fd = os.open(self._path, flags, 0o600)
+        try:
+            if create:
+                # hugetlbfs files are sized in whole huge pages
+                length = -(-size // _HUGEPAGE_SIZE) * _HUGEPAGE_SIZE
+                os.ftruncate(fd, length)
+            else:
+                size = length = os.fstat(fd).st_size
+            self._mmap = mmap.mmap(fd, length)
+        except BaseException:
+            if create:
+                os.unlink(self._path)
+            raise
+        finally:
+            os.close(fd)
+        self._buf: Optional[memoryview] = memoryview(self._mmap)[:size]
+
+    @property
+    def buf(self) -> memoryview:
+        return self._buf
+
+    @property
+    def size(self) -> int:
+        return len(self._buf)
+
+    def close(self) -> None:
+        if self._buf is not None:
+            self._buf.release()
+            self._buf = None
+            self._mmap.close()
+
+    def unlink(self) -> None:
+        os.unlink(self._path)
+
+
+_Segment = Union[SharedMemory, _HugePageMemory]
+
+
+def _hugepage_path(name: str) -> str:
+    """Path of the hugetlbfs file backing a huge-page channel."""
+    return os.path.join(_HUGEPAGE_DIR, name)
+
+
+def _hugepages_supported() -> bool:
+    return sys.platform.startswith("linux") and os.path.isdir(_HUGEPAGE_DIR)
+
+
+def _create_segment(name: str, size: int, huge_pages: bool) -> _Segment:
+    """Create a segment, on huge pages if requested and available."""
+    if huge_pages and size >= _HUGEPAGE_SIZE and _hugepages_supported():
+        try:
+            return _HugePageMemory(name, create=True, size=size)
+        except OSError:
+            pass  # fall back to regular shared memory
+    return SharedMemory(name=name, create=True, size=size)
+
+
+def _open_segment(name: str) -> _Segment:
+    """Open an existing segment, falling back to a huge-page one.
+
+    Regular shared memory wins: a Python producer removes both kinds on
+    startup, but a C++ producer only knows about regular segments.
+    """
+    try:
+        return SharedMemory(name=name, create=False)
+    except FileNotFoundError:
+        if not (_hugepages_supported() and os.path.exists(_hugepage_path(name))):
+            raise
+    return _HugePageMemory(name)
+
+
+def _advise_sequential(shm: _Segment) -> None:
+    """Hint that the data area is accessed sequentially (MADV_SEQUENTIAL).
+
+    Only the pages after the header are advised; the header itself is
+    accessed at random. A no-op where madvise is unavailable.
+    """
+    mm = getattr(shm, "_mmap", None)
+    if mm is None or not hasattr(mm, "madvise") or not hasattr(mmap, "MADV_SEQUENTIAL"):
+        return
+    page = _HUGEPAGE_SIZE if isinstance(shm, _HugePageMemory) else mmap.PAGESIZE
+    start = -(-HEADER_SIZE // page) * page
+    if start < len(mm):
+        try:
+            mm.madvise(mmap.MADV_SEQUENTIAL, start, len(mm) - start)
+        except OSError:
+            pass  # advisory only
+
+
+def _notify_path(name: str) -> str:
+    """Path of the FIFO carrying producer -> consumer wakeups."""
+    return os.path.join(tempfile.gettempdir(), f"shm_{name}.notify")
+
+
+def _open_notify_fifo(name: str, create: bool) -> Optional[int]:
+    """Open the wakeup FIFO for ``name`` as a non-blocking O_RDWR fd.
+
+    Holding both ends open means open() never blocks and select() never
+    sees a spurious EOF when the other side goes away.
+
+    Returns:
+        The fd, or None if FIFOs are unsupported or (when not ``create``)
+        the producer did not enable notifications or the FIFO cannot be
+        opened, e.g. it belongs to another user.
+    """
+    if not hasattr(os, "mkfifo"):
+        return None
+    path = _notify_path(name)
+    if create:
+        try:
+            os.mkfifo(path, 0o600)
+        except FileExistsError:
+            pass
+    try:
+        if not stat.S_ISFIFO(os.stat(path).st_mode):
+            return None
+        return os.open(path, os.O_RDWR | os.O_NONBLOCK)
+    except FileNotFoundError:
+        return None
+    except OSError:
+        if create:
+            raise
+        return None  # consumer falls back to timed sleeps
+
 
 class ShmProducer:
     """Shared memory producer. Creates shared memory and writes messages.
@@ -27,12 +208,25 @@ class ShmProducer:
     Args:
         name: Shared memory name (alphanumeric).
         capacity: Data area size in bytes.
+        notify: If True, signal ShmConsumer.wait() after each write.
+        msg_size: If > 0, every message is exactly this many bytes and is
+            stored without a length prefix (FixedSizeRingBuffer).
+        huge_pages: If True, back the channel with huge pages when the
+            platform provides them and ``capacity`` is at least 2 MiB.
     """
 
-    __slots__ = ("_shm", "_ring", "_buf_view", "_name")
+    __slots__ = ("_shm", "_ring", "_buf_view", "_name", "_notify_fd")
 
-    def __init__(self, name: str, capacity: int) -> None:
+    def __init__(
+        self,
+        name: str,
+        capacity: int,
+        notify: bool = False,
+        msg_size: int = 0,
+        huge_pages: bool = False,
+    ) -> None:
         self._name = name
+        self._notify_fd: Optional[int] = None
         total_size = capacity + HEADER_SIZE
 
         # Clean up any leftover segment
@@ -42,20 +236,33 @@ class ShmProducer:
             old.unlink()
         except FileNotFoundError:
             pass
+        if _hugepages_supported():
+            try:
+                os.unlink(_hugepage_path(name))
+            except FileNotFoundError:
+                pass
 
-        self._shm: Optional[SharedMemory] = SharedMemory(
-            name=name, create=True, size=total_size
-        )
+        self._shm: Optional[_Segment] = _create_segment(name, total_size, huge_pages)
+        _advise_sequential(self._shm)
         self._buf_view = self._shm.buf
-        self._ring: Optional[ByteRingBuffer] = ByteRingBuffer(
-            self._buf_view, is_producer=True
+        self._ring: Optional[ByteRingBuffer] = (
+            FixedSizeRingBuffer(self._buf_view, msg_size, is_producer=True)
+            if msg_size > 0
+            else ByteRingBuffer(self._buf_view, is_producer=True)
         )
+        if notify:
+            self._notify_fd = _open_notify_fifo(name, create=True)
 
     def write(self, data: bytes) -> bool:
         """Write a message to shared memory."""
-        if self._ring is None:
+        if self._ring is None or not self._ring.write(data):
             return False
-        return self._ring.write(data)
+        if self._notify_fd is not None:
+            try:
+                os.write(self._notify_fd, b"\0")
+            except BlockingIOError:
+                pass  # FIFO full: the consumer already has pending wakeups
+        return True
 
     def writeable_bytes(self) -> int:
         return self._ring.writeable_bytes() if self._ring else 0
@@ -72,6 +279,9 @@ class ShmProducer:
         """Release resources without unlinking shared memory."""
         self._ring = None
         self._buf_view = None
+        if self._notify_fd is not None:
+            os.close(self._notify_fd)
+            self._notify_fd = None
         if self._shm is not None:
             self._shm.close()
             self._shm = None
@@ -80,6 +290,13 @@ class ShmProducer:
         """Close and unlink shared memory."""
         self._ring = None
         self._buf_view = None
+        if self._notify_fd is not None:
+            os.close(self._notify_fd)
+            self._notify_fd = None
+            try:
+                os.unlink(_notify_path(self._name))
+            except FileNotFoundError:
+                pass
         if self._shm is not None:
             self._shm.close()
             try:
@@ -104,18 +321,31 @@ class ShmConsumer:
     Args:
         name: Shared memory name (must match producer).
         size: Expected total size. Pass 0 to auto-detect.
+        msg_size: Fixed message size the producer was created with, or 0
+            for length-prefixed messages.
+
+    Raises:
+        ValueError: If the segment's layout version or message size does
+            not match.
     """
 
-    __slots__ = ("_shm", "_ring", "_buf_view", "_name")
+    __slots__ = ("_shm", "_ring", "_buf_view", "_name", "_notify_fd")
 
-    def __init__(self, name: str, size: int = 0) -> None:
+    def __init__(self, name: str, size: int = 0, msg_size: int = 0) -> None:
         self._name = name
-        self._shm: Optional[SharedMemory] = SharedMemory(name=name, create=False)
-        actual_size = size if size > 0 else self._shm.size
-        self._buf_view = self._shm.buf[:actual_size]
-        self._ring: Optional[ByteRingBuffer] = ByteRingBuffer(
-            self._buf_view, is_producer=False
+        self._notify_fd: Optional[int] = None
+        self._shm: Optional[_Segment] = _open_segment(name)
+        _advise_sequential(self._shm)
+        if size <= 0 or size == self._shm.size:
+            self._buf_view = self._shm.buf
+        else:
+            self._buf_view = self._shm.buf[:size]
+        self._ring: Optional[ByteRingBuffer] = (
+            FixedSizeRingBuffer(self._buf_view, msg_size)
+            if msg_size > 0
+            else ByteRingBuffer(self._buf_view, is_producer=False)
         )
+        self._notify_fd = _open_notify_fifo(name, create=False)
 
     def read(self) -> Optional[bytes]:
         """Read one message from shared memory."""
@@ -123,12 +353,60 @@ class ShmConsumer:
             return None
         return self._ring.read()
 
+    def read_into(self, out) -> int:
+        """Read one message into ``out``. Returns payload length, or 0."""
+        if self._ring is None:
+            return 0
+        return self._ring.read_into(out)
+
+    def read_view(self) -> Optional[Tuple[memoryview, Callable[[], None]]]:
+        """Borrow the next message as ``(payload, release)`` without copying.
+
+        Call ``release()`` once done with the payload, and drop the payload
+        before close(). See ByteRingBuffer.read_view().
+        """
+        if self._ring is None:
+            return None
+        return self._ring.read_view()
+
+    def read_many(self, max_msgs: int = 64) -> List[bytes]:
+        """Read up to ``max_msgs`` messages with a single tail update."""
+        if self._ring is None:
+            return []
+        return self._ring.read_many(max_msgs)
+
     def has_data(self) -> bool:
         return self._ring.has_data() if self._ring else False
 
     def readable_bytes(self) -> int:
         return self._ring.readable_bytes() if self._ring else 0
 
+    def wait(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for a message.
+
+        Spins for a few rounds, yielding the CPU between polls, then
+        blocks on the producer's wakeup FIFO when it has one, otherwise
+        sleeps for ``timeout``.
+
+        Returns:
+            True if data is available.
+        """
+        for _ in range(_SPIN_ROUNDS):
+            if self.has_data():
+                return True
+            _pause()
+        fd = self._notify_fd
+        if fd is None:
+            time.sleep(timeout)
+        else:
+            ready, _, _ = select.select([fd], [], [], timeout)
+            if ready:
+                try:
+                    os.read(fd, 4096)  # drain; has_data() is the source of truth
+                except BlockingIOError:
+                    pass
+        return self.has_data()
+
     @property
     def capacity(self) -> int:
         return self._ring.capacity if self._ring else 0
@@ -141,6 +419,9 @@ class ShmConsumer:
         """Release resources."""
         self._ring = None
         self._buf_view = None
+        if self._notify_fd is not None:
+            os.close(self._notify_fd)
+            self._notify_fd = None
         if self._shm is not None:
             self._shm.close()
             self._shm = None
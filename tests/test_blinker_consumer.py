@@ -8,25 +8,25 @@ Usage:
 
 import os
 import sys
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 import numpy as np
-from blinker import signal
+from blinker import Namespace
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "py"))
 
 # Import signals and classes
 from consumer_demo_blinker import (
+    ShmReader,
     FrameDecoder,
     FrameDisplay,
     FPSCounter,
+    FramePipeline,
     ErrorLogger,
-    frame_received,
-    frame_decoded,
-    frame_displayed,
-    fps_updated,
-    error_occurred,
+    event_bus,
     WIDTH,
     HEIGHT,
     CHANNELS,
@@ -34,36 +34,36 @@ from consumer_demo_blinker import (
 )
 
 
-class TestBlinkerEventFlow(unittest.TestCase):
-    """测试 Blinker 事件流"""
+class SignalTestCase(unittest.TestCase):
+    """每个测试使用独立的 Blinker 命名空间，接收者不会跨测试残留"""
 
     def setUp(self):
-        """每个测试前清理信号连接"""
-        # 清理所有信号连接
-        for sig in [
-            frame_received,
-            frame_decoded,
-            frame_displayed,
-            fps_updated,
-            error_occurred,
-        ]:
-            sig.receivers.clear()
+        self.ns = Namespace()
+        self.frame_received = self.ns.signal("frame.received")
+        self.frame_decoded = self.ns.signal("frame.decoded")
+        self.frame_displayed = self.ns.signal("frame.displayed")
+        self.fps_updated = self.ns.signal("fps.updated")
+        self.error_occurred = self.ns.signal("error.occurred")
+
+
+class TestBlinkerEventFlow(SignalTestCase):
+    """测试 Blinker 事件流"""
 
     def test_frame_decoder_event_flow(self):
         """测试帧解码事件流"""
         # 创建解码器
-        decoder = FrameDecoder()
+        decoder = FrameDecoder(ns=self.ns)
 
         # 创建接收器来验证 frame_decoded 信号
         received_frames = []
 
-        @frame_decoded.connect
+        @self.frame_decoded.connect
         def capture_decoded(sender, frame, frame_idx):
             received_frames.append((frame.shape, frame_idx))
 
         # 发送 frame_received 信号
         fake_data = b"\x01\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4)
-        frame_received.send(None, data=fake_data)
+        self.frame_received.send(None, data=fake_data)
 
         # 验证 frame_decoded 被触发
         self.assertEqual(len(received_frames), 1)
@@ -72,95 +72,128 @@ class TestBlinkerEventFlow(unittest.TestCase):
 
     def test_fps_counter(self):
         """测试 FPS 计数器"""
-        fps_counter = FPSCounter(report_interval=5)
+        fps_counter = FPSCounter(report_interval=5, ns=self.ns)
 
         # 模拟 5 帧
         for i in range(5):
-            frame_displayed.send(None, frame_idx=i)
+            self.frame_displayed.send(None, frame_idx=i)
 
         # 验证计数
         self.assertEqual(fps_counter.count, 5)
 
+    def test_fps_report(self):
+        """测试每 report_interval 帧发送一次 fps_updated"""
+        fps_counter = FPSCounter(report_interval=5, ns=self.ns)
+        reports = []
+
+        @self.fps_updated.connect
+        def capture_fps(sender, fps, total_frames):
+            reports.append((fps, total_frames))
+
+        with patch("builtins.print"):
+            for i in range(10):
+                fps_counter.tick(i)
+
+        self.assertEqual([total for _, total in reports], [5, 10])
+        self.assertTrue(all(fps > 0 for fps, _ in reports))
+
     def test_error_logger(self):
         """测试错误日志"""
-        error_logger = ErrorLogger()
+        error_logger = ErrorLogger(ns=self.ns)
 
         # 捕获 print 输出
         with patch("builtins.print") as mock_print:
-            error_occurred.send(None, error="Test error")
+            self.error_occurred.send(None, error="Test error")
             mock_print.assert_called_once_with("[ERROR] Test error")
 
     def test_invalid_frame_size(self):
         """测试无效帧大小处理"""
-        decoder = FrameDecoder()
+        decoder = FrameDecoder(ns=self.ns)
 
         # 创建错误接收器
         errors = []
 
-        @error_occurred.connect
+        @self.error_occurred.connect
         def capture_error(sender, error):
             errors.append(error)
 
         # 发送无效大小的数据
         invalid_data = b"\x00" * 100  # 太小
-        frame_received.send(None, data=invalid_data)
+        self.frame_received.send(None, data=invalid_data)
 
         # 验证错误被捕获
         self.assertEqual(len(errors), 1)
         self.assertIn("Decode failed", errors[0])
 
+    def test_decoder_reuses_buffer(self):
+        """测试解码器复用预分配缓冲区"""
+        decoder = FrameDecoder(ns=self.ns)
+        frames = []
+
+        @self.frame_decoded.connect
+        def capture_decoded(sender, frame, frame_idx):
+            frames.append((frame, frame_idx))
+
+        decoder.buffer[:4] = b"\x07\x00\x00\x00"
+        self.frame_received.send(None, data=decoder.buffer)
+        self.frame_received.send(None, data=decoder.buffer)
+
+        self.assertEqual(len(frames), 2)
+        self.assertIs(frames[0][0], frames[1][0])
+        self.assertEqual(frames[0][0].shape, (HEIGHT, WIDTH, CHANNELS))
+        self.assertEqual(frames[0][1], 7)
+
     def test_signal_isolation(self):
         """测试信号隔离性"""
         # 创建两个独立的解码器
-        decoder1 = FrameDecoder()
-        decoder2 = FrameDecoder()
+        decoder1 = FrameDecoder(ns=self.ns)
+        decoder2 = FrameDecoder(ns=self.ns)
 
         decoded_count = [0]
 
-        @frame_decoded.connect
+        @self.frame_decoded.connect
         def count_decoded(sender, frame, frame_idx):
             decoded_count[0] += 1
 
         # 发送一次信号
         fake_data = b"\x00" * FRAME_SIZE
-        frame_received.send(None, data=fake_data)
+        self.frame_received.send(None, data=fake_data)
 
         # 两个解码器都连接到 frame_received，各自触发一次 frame_decoded
         self.assertEqual(decoded_count[0], 2)
 
+    def test_namespace_isolation(self):
+        """测试传入命名空间的组件不连接到默认 event_bus"""
+        default_received = event_bus.signal("frame.received")
+        before = len(default_received.receivers)
 
-class TestComponentIntegration(unittest.TestCase):
-    """测试组件集成"""
+        decoder = FrameDecoder(ns=self.ns)
 
-    def setUp(self):
-        """清理信号"""
-        for sig in [
-            frame_received,
-            frame_decoded,
-            frame_displayed,
-            fps_updated,
-            error_occurred,
-        ]:
-            sig.receivers.clear()
+        self.assertEqual(len(default_received.receivers), before)
+        self.assertEqual(len(self.frame_received.receivers), 1)
+
+
+class TestComponentIntegration(SignalTestCase):
+    """测试组件集成"""
 
     def test_full_pipeline(self):
         """测试完整流水线: received → decoded → displayed"""
         # 初始化组件
-        decoder = FrameDecoder()
+        decoder = FrameDecoder(ns=self.ns)
 
         # 跳过 FrameDisplay（需要 OpenCV）
         display_called = [False]
 
-        @frame_decoded.connect
+        @self.frame_decoded.connect
         def mock_display(sender, frame, frame_idx):
             display_called[0] = True
-            frame_displayed.send(sender, frame_idx=frame_idx)
+            self.frame_displayed.send(sender, frame_idx=frame_idx)
 
-        fps_counter = FPSCounter(report_interval=1)
+        fps_counter = FPSCounter(report_interval=1, ns=self.ns)
 
         # 发送帧
         fake_data = b"\x05\x00\x00\x00" + b"\xFF" * (FRAME_SIZE - 4)
-        frame_received.send(None, data=fake_data)
+        self.frame_received.send(None, data=fake_data)
 
         # 验证整个流水线
         self.assertTrue(display_called[0])
@@ -168,24 +201,209 @@ class TestComponentIntegration(unittest.TestCase):
 
     def test_multiple_frames(self):
         """测试多帧处理"""
-        decoder = FrameDecoder()
-        fps_counter = FPSCounter(report_interval=10)
+        decoder = FrameDecoder(ns=self.ns)
+        fps_counter = FPSCounter(report_interval=10, ns=self.ns)
 
         # 模拟显示
-        @frame_decoded.connect
+        @self.frame_decoded.connect
         def mock_display(sender, frame, frame_idx):
-            frame_displayed.send(sender, frame_idx=frame_idx)
+            self.frame_displayed.send(sender, frame_idx=frame_idx)
 
         # 发送 20 帧
         for i in range(20):
             frame_idx_bytes = i.to_bytes(4, byteorder="little")
             fake_data = frame_idx_bytes + b"\x00" * (FRAME_SIZE - 4)
-            frame_received.send(None, data=fake_data)
+            self.frame_received.send(None, data=fake_data)
 
         # 验证计数
         self.assertEqual(fps_counter.count, 20)
 
 
+class TestFramePipeline(SignalTestCase):
+    """测试直接调用的帧处理链"""
+
+    def _make_display(self):
+        display = MagicMock(spec=FrameDisplay)
+        display.has_cv2 = True
+        return display
+
+    def test_on_frame(self):
+        """测试帧依次经过解码、显示、计数，且不发送帧信号"""
+        decoder = FrameDecoder(ns=self.ns)
+        display = self._make_display()
+        fps_counter = FPSCounter(report_interval=10, ns=self.ns)
+        pipeline = FramePipeline(decoder, display, fps_counter, ns=self.ns)
+
+        decoded = []
+
+        @self.frame_decoded.connect
+        def capture_decoded(sender, frame, frame_idx):
+            decoded.append(frame_idx)
+
+        decoder.buffer[:4] = b"\x09\x00\x00\x00"
+        pipeline.on_frame(decoder.buffer)
+
+        display.show.assert_called_once()
+        self.assertEqual(display.show.call_args[0][0].shape, (HEIGHT, WIDTH, CHANNELS))
+        self.assertEqual(fps_counter.count, 1)
+        self.assertEqual(decoded, [])
+
+    def test_decode_error(self):
+        """测试解码失败时通过 error_occurred 上报"""
+        display = self._make_display()
+        fps_counter = FPSCounter(ns=self.ns)
+        pipeline = FramePipeline(FrameDecoder(ns=self.ns), display, fps_counter, ns=self.ns)
+
+        errors = []
+
+        @self.error_occurred.connect
+        def capture_error(sender, error):
+            errors.append(error)
+
+        pipeline.on_frame(b"\x00" * 100)
+
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Decode failed", errors[0])
+        display.show.assert_not_called()
+        self.assertEqual(fps_counter.count, 0)
+
+
+class TestShmReader(SignalTestCase):
+    """测试 ShmReader 批量读取"""
+
+    SHM_NAME = "test_blinker_reader"
+
+    def setUp(self):
+        super().setUp()
+        from shm_channel import ShmProducer
+
+        self.producer = ShmProducer(self.SHM_NAME, 4 * (FRAME_SIZE + 4))
+        self.reader = ShmReader(self.SHM_NAME, ns=self.ns)
+
+    def tearDown(self):
+        self.reader.close()
+        self.producer.destroy()
+
+    def test_poll_batch(self):
+        """测试一次 poll 处理多帧，无效帧只报告错误"""
+        received = []
+        errors = []
+
+        @self.frame_received.connect
+        def capture_frame(sender, data):
+            received.append(data[:4])
+
+        @self.error_occurred.connect
+        def capture_error(sender, error):
+            errors.append(error)
+
+        self.producer.write(b"\x01\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+        self.producer.write(b"short")
+        self.producer.write(b"\x02\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+
+        self.assertTrue(self.reader.poll())
+        self.assertEqual(received, [b"\x01\x00\x00\x00", b"\x02\x00\x00\x00"])
+        self.assertEqual(errors, ["Invalid frame size"])
+        self.assertFalse(self.reader.poll())
+
+    def test_poll_into_buffer(self):
+        """测试帧直接读入预分配缓冲区"""
+        self.reader.frame_buffer = bytearray(FRAME_SIZE)
+        received = []
+
+        @self.frame_received.connect
+        def capture_frame(sender, data):
+            self.assertIs(data, self.reader.frame_buffer)
+            received.append(bytes(data[:4]))
+
+        self.producer.write(b"\x03\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+        self.producer.write(b"\x04\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+
+        self.assertTrue(self.reader.poll())
+        self.assertEqual(received, [b"\x03\x00\x00\x00", b"\x04\x00\x00\x00"])
+        self.assertFalse(self.reader.poll())
+
+    def test_poll_into_oversized(self):
+        """测试超出 frame_buffer 的帧被跳过并报告错误，后续帧照常处理"""
+        self.reader.frame_buffer = bytearray(FRAME_SIZE)
+        received = []
+        errors = []
+
+        @self.frame_received.connect
+        def capture_frame(sender, data):
+            received.append(bytes(data[:4]))
+
+        @self.error_occurred.connect
+        def capture_error(sender, error):
+            errors.append(error)
+
+        self.producer.write(b"\x00" * (FRAME_SIZE + 4))
+        self.producer.write(b"\x06\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+
+        self.assertTrue(self.reader.poll())
+        self.assertEqual(errors, ["Invalid frame size"])
+        self.assertEqual(received, [b"\x06\x00\x00\x00"])
+        self.assertFalse(self.reader.poll())
+
+    def test_wait_notify(self):
+        """测试生产者开启通知时 wait 被唤醒"""
+        from shm_channel import ShmProducer
+
+        self.reader.close()
+        self.producer.destroy()
+        self.producer = ShmProducer(self.SHM_NAME, 4 * (FRAME_SIZE + 4), notify=True)
+        self.reader = ShmReader(self.SHM_NAME, ns=self.ns)
+
+        self.assertFalse(self.reader.wait(0.01))
+
+        writer = threading.Timer(0.05, self.producer.write, args=(b"\x00" * FRAME_SIZE,))
+        writer.start()
+        t0 = time.monotonic()
+        self.assertTrue(self.reader.wait(5.0))
+        self.assertLess(time.monotonic() - t0, 2.0)  # 被通知唤醒，而非超时
+        writer.join()
+
+        self.assertTrue(self.reader.poll())
+        self.assertFalse(self.reader.wait(0.01))
+
+    def test_notify_fifo_unopenable(self):
+        """测试通知 FIFO 无法打开（如属于其他用户）时退化为休眠等待"""
+        from shm_channel import ShmProducer
+
+        self.reader.close()
+        self.producer.destroy()
+        self.producer = ShmProducer(self.SHM_NAME, 4 * (FRAME_SIZE + 4), notify=True)
+
+        real_open = os.open
+
+        def deny_fifo(path, *args, **kwargs):
+            if path.endswith(".notify"):
+                raise PermissionError(13, "Permission denied", path)
+            return real_open(path, *args, **kwargs)
+
+        with patch("shm_channel.os.open", deny_fifo):
+            self.reader = ShmReader(self.SHM_NAME, ns=self.ns)
+
+        self.assertFalse(self.reader.wait(0.01))
+        self.producer.write(b"\x00" * FRAME_SIZE)
+        self.assertTrue(self.reader.wait(0.01))
+
+    def test_poll_pipeline(self):
+        """测试设置 pipeline 后帧直接交给 pipeline"""
+        self.reader.pipeline = MagicMock(spec=FramePipeline)
+        signalled = []
+
+        @self.frame_received.connect
+        def capture_frame(sender, data):
+            signalled.append(data)
+
+        self.producer.write(b"\x05\x00\x00\x00" + b"\x00" * (FRAME_SIZE - 4))
+
+        self.assertTrue(self.reader.poll())
+        self.reader.pipeline.on_frame.assert_called_once()
+        self.assertEqual(signalled, [])
+
+
 def run_tests():
     """运行所有测试"""
     loader = unittest.TestLoader()
@@ -193,6 +411,8 @@ def run_tests():
 
     suite.addTests(loader.loadTestsFromTestCase(TestBlinkerEventFlow))
     suite.addTests(loader.loadTestsFromTestCase(TestComponentIntegration))
+    suite.addTests(loader.loadTestsFromTestCase(TestFramePipeline))
+    suite.addTests(loader.loadTestsFromTestCase(TestShmReader))
 
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -24,8 +24,8 @@ static int failed = 0;
 
 void test_basic_write_read() {
   std::printf("test_basic_write_read\n");
-  std::vector<uint8_t> mem(16 + 64, 0);  // header + 64B data
-  shm::ByteRingBuffer ring(mem.data(), 16 + 64, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 64, 0);  // header + 64B data
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 64, true);
 
   CHECK("capacity", ring.Capacity(), 64u);
   CHECK("initial readable", ring.ReadableBytes(), 0u);
@@ -33,7 +33,7 @@ void test_basic_write_read() {
 
   bool ok = ring.Write("hello", 5);
   CHECK("write ok", ok, true);
-  CHECK("readable after write", ring.ReadableBytes(), 9u);  // 4 + 5
+  CHECK("readable after write", ring.ReadableBytes(), 12u);  // 4 + 5 padded to 8
 
   char out[64] = {};
   uint32_t len = ring.Read(out, sizeof(out));
@@ -44,8 +44,8 @@ void test_basic_write_read() {
 
 void test_multiple_messages() {
   std::printf("test_multiple_messages\n");
-  std::vector<uint8_t> mem(16 + 256, 0);
-  shm::ByteRingBuffer ring(mem.data(), 16 + 256, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 256, 0);
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 256, true);
 
   const char* msgs[] = {"msg1", "message_two", "3"};
   uint32_t lens[] = {4, 11, 1};
@@ -68,8 +68,8 @@ void test_multiple_messages() {
 
 void test_wrap_around() {
   std::printf("test_wrap_around\n");
-  std::vector<uint8_t> mem(16 + 32, 0);  // 32B data area
-  shm::ByteRingBuffer ring(mem.data(), 16 + 32, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 32, 0);  // 32B data area
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 32, true);
 
   // Fill most of buffer: 4 + 20 = 24 bytes
   char fill[20];
@@ -91,10 +91,69 @@ void test_wrap_around() {
   CHECK("wrap read data", out[0] == 'B' && out[19] == 'B', true);
 }
 
+void test_wrap_marker() {
+  std::printf("test_wrap_marker\n");
+  std::vector<uint8_t> mem(shm::kHeaderSize + 32, 0);  // 32B data area
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 32, true);
+
+  // 4 + 20 = 24 bytes, leaves 8 bytes before the end
+  char fill[20];
+  std::memset(fill, 'C', 20);
+  ring.Write(fill, 18);
+  char out[32] = {};
+  ring.Read(out, sizeof(out));
+
+  // 4 + 12 = 16 bytes does not fit in the remaining 8: marker + restart at 0
+  std::memset(fill, 'D', 10);
+  bool ok = ring.Write(fill, 10);
+  CHECK("marker write", ok, true);
+  uint32_t marker = 1;
+  std::memcpy(&marker, mem.data() + shm::kHeaderSize + 24, 4);
+  CHECK("marker is zero", marker, 0u);
+  const uint8_t* data = mem.data() + shm::kHeaderSize;
+  CHECK("record at offset 0", data[4] == 'D' && data[13] == 'D', true);
+  CHECK("readable includes skip", ring.ReadableBytes(), 8u + 16u);
+
+  uint32_t len = ring.Read(out, sizeof(out));
+  CHECK("marker read len", len, 10u);
+  CHECK("marker read data", out[0] == 'D' && out[9] == 'D', true);
+  CHECK("empty after marker", ring.HasData(), false);
+
+  // Record larger than the whole ring never fits; empty writes are rejected
+  char big[29] = {};
+  CHECK("reject oversized", ring.Write(big, sizeof(big)), false);
+  CHECK("reject empty", ring.Write("", 0), false);
+}
+
+void test_wrap_marker_alone() {
+  std::printf("test_wrap_marker_alone\n");
+  std::vector<uint8_t> mem(shm::kHeaderSize + 32, 0);  // 32B data area
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 32, true);
+
+  // 4 + 12 = 16 bytes, leaves 16 bytes before the end
+  char fill[20];
+  std::memset(fill, 'G', 12);
+  ring.Write(fill, 12);
+  char out[32] = {};
+  ring.Read(out, sizeof(out));
+
+  // 4 + 20 = 24 bytes fits the empty ring but not before the end: the
+  // marker is published alone, and once consumed the record fits at 0
+  std::memset(fill, 'H', 20);
+  CHECK("empty ring writeable", ring.WriteableBytes(), 32u);
+  CHECK("marker alone write", ring.Write(fill, 20), false);
+  CHECK("marker alone readable", ring.ReadableBytes(), 16u);
+  CHECK("marker alone read", ring.Read(out, sizeof(out)), 0u);
+  CHECK("marker consumed", ring.ReadableBytes(), 0u);
+  CHECK("write after marker", ring.Write(fill, 20), true);
+  uint32_t len = ring.Read(out, sizeof(out));
+  CHECK("read after marker", len == 20 && out[0] == 'H' && out[19] == 'H', true);
+}
+
 void test_full_buffer() {
   std::printf("test_full_buffer\n");
-  std::vector<uint8_t> mem(16 + 16, 0);  // 16B data area
-  shm::ByteRingBuffer ring(mem.data(), 16 + 16, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 16, 0);  // 16B data area
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 16, true);
 
   // 4 + 12 = 16, exactly full
   char data[12];
@@ -115,14 +174,14 @@ void test_full_buffer() {
 
 void test_producer_consumer_views() {
   std::printf("test_producer_consumer_views\n");
-  std::vector<uint8_t> mem(16 + 64, 0);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 64, 0);
 
   // Producer writes
-  shm::ByteRingBuffer prod(mem.data(), 16 + 64, true);
+  shm::ByteRingBuffer prod(mem.data(), shm::kHeaderSize + 64, true);
   prod.Write("cross-lang", 10);
 
   // Consumer reads (same memory, different view)
-  shm::ByteRingBuffer cons(mem.data(), 16 + 64, false);
+  shm::ByteRingBuffer cons(mem.data(), shm::kHeaderSize + 64, false);
   CHECK("consumer capacity", cons.Capacity(), 64u);
   CHECK("consumer has_data", cons.HasData(), true);
 
@@ -130,12 +189,21 @@ void test_producer_consumer_views() {
   uint32_t len = cons.Read(out, sizeof(out));
   CHECK("consumer read len", len, 10u);
   CHECK("consumer read data", std::memcmp(out, "cross-lang", 10) == 0, true);
+
+  // Queries about the other side's index stay correct on either instance
+  CHECK("consumer writeable", cons.WriteableBytes(), 64u);
+  prod.Write("again", 5);
+  CHECK("consumer writeable after write", cons.WriteableBytes(), 64u - 12u);
+  CHECK("producer readable", prod.ReadableBytes(), 12u);
+  cons.Read(out, sizeof(out));
+  CHECK("producer readable after read", prod.ReadableBytes(), 0u);
+  CHECK("producer has_data after read", prod.HasData(), false);
 }
 
 void test_large_message() {
   std::printf("test_large_message\n");
-  std::vector<uint8_t> mem(16 + 8192, 0);
-  shm::ByteRingBuffer ring(mem.data(), 16 + 8192, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 8192, 0);
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 8192, true);
 
   // 4096 byte payload
   std::vector<char> large(4096);
@@ -152,8 +220,8 @@ void test_large_message() {
 
 void test_has_data() {
   std::printf("test_has_data\n");
-  std::vector<uint8_t> mem(16 + 64, 0);
-  shm::ByteRingBuffer ring(mem.data(), 16 + 64, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 64, 0);
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 64, true);
 
   CHECK("empty has_data", ring.HasData(), false);
   ring.Write("x", 1);
@@ -162,8 +230,8 @@ void test_has_data() {
 
 void test_message_too_large_for_output() {
   std::printf("test_message_too_large_for_output\n");
-  std::vector<uint8_t> mem(16 + 64, 0);
-  shm::ByteRingBuffer ring(mem.data(), 16 + 64, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 64, 0);
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 64, true);
 
   ring.Write("hello world!", 12);
 
@@ -175,24 +243,113 @@ void test_message_too_large_for_output() {
   CHECK("empty after skip", ring.HasData(), false);
 }
 
+void test_header_layout() {
+  std::printf("test_header_layout\n");
+  std::vector<uint8_t> mem(shm::kHeaderSize + 64, 0xAB);
+  shm::ByteRingBuffer prod(mem.data(), shm::kHeaderSize + 64, true);
+  prod.Write("x", 1);
+
+  uint32_t head = 0;
+  uint32_t capacity = 0;
+  uint32_t version = 0;
+  std::memcpy(&head, mem.data() + 0, 4);
+  std::memcpy(&capacity, mem.data() + 128, 4);
+  std::memcpy(&version, mem.data() + 132, 4);
+  CHECK("head offset 0", head, 8u);
+  CHECK("capacity offset 128", capacity, 64u);
+  CHECK("version offset 132", version, shm::kLayoutVersion);
+  CHECK("padding zeroed", mem[4] == 0 && mem[191] == 0, true);
+  CHECK("consumer compatible",
+        shm::ByteRingBuffer(mem.data(), shm::kHeaderSize + 64, false).IsCompatible(), true);
+
+  // A segment written with another layout is rejected
+  const uint32_t old_version = 0;
+  std::memcpy(mem.data() + 132, &old_version, 4);
+  CHECK("consumer incompatible",
+        shm::ByteRingBuffer(mem.data(), shm::kHeaderSize + 64, false).IsCompatible(), false);
+}
+
 void test_round_down_pow2() {
   std::printf("test_round_down_pow2\n");
   // 100 bytes data area -> rounds down to 64
-  std::vector<uint8_t> mem(16 + 100, 0);
-  shm::ByteRingBuffer ring(mem.data(), 16 + 100, true);
+  std::vector<uint8_t> mem(shm::kHeaderSize + 100, 0);
+  shm::ByteRingBuffer ring(mem.data(), shm::kHeaderSize + 100, true);
   CHECK("round down 100->64", ring.Capacity(), 64u);
 
   // 128 bytes data area -> stays 128
-  std::vector<uint8_t> mem2(16 + 128, 0);
-  shm::ByteRingBuffer ring2(mem2.data(), 16 + 128, true);
+  std::vector<uint8_t> mem2(shm::kHeaderSize + 128, 0);
+  shm::ByteRingBuffer ring2(mem2.data(), shm::kHeaderSize + 128, true);
   CHECK("exact pow2 128", ring2.Capacity(), 128u);
 
   // 33 bytes data area -> rounds down to 32
-  std::vector<uint8_t> mem3(16 + 33, 0);
-  shm::ByteRingBuffer ring3(mem3.data(), 16 + 33, true);
+  std::vector<uint8_t> mem3(shm::kHeaderSize + 33, 0);
+  shm::ByteRingBuffer ring3(mem3.data(), shm::kHeaderSize + 33, true);
   CHECK("round down 33->32", ring3.Capacity(), 32u);
 }
 
+// ---- FixedSizeRingBuffer tests ----
+
+void test_fixed_size() {
+  std::printf("test_fixed_size\n");
+  // 100 bytes data area -> 8 slots of 12 bytes
+  std::vector<uint8_t> mem(shm::kHeaderSize + 100, 0xAB);
+  shm::FixedSizeRingBuffer prod(mem.data(), shm::kHeaderSize + 100, 12, true);
+  CHECK("fixed capacity", prod.Capacity(), 96u);
+  CHECK("fixed writeable", prod.WriteableBytes(), 96u);
+
+  uint32_t msg_size = 0;
+  std::memcpy(&msg_size, mem.data() + 136, 4);
+  CHECK("msg_size offset 136", msg_size, 12u);
+
+  CHECK("reject other size", prod.Write("short", 5), false);
+  uint8_t msg[12];
+  for (uint8_t i = 0; i < 8; ++i) {
+    std::memset(msg, i, sizeof(msg));
+    CHECK("fixed write", prod.Write(msg, sizeof(msg)), true);
+  }
+  CHECK("reject on full", prod.Write(msg, sizeof(msg)), false);
+  CHECK("no length prefix", mem[shm::kHeaderSize + 11], 0);
+
+  shm::FixedSizeRingBuffer cons(mem.data(), shm::kHeaderSize + 100, 12, false);
+  CHECK("fixed compatible", cons.IsCompatible(), true);
+  CHECK("fixed readable", cons.ReadableBytes(), 96u);
+
+  uint8_t out[16] = {};
+  CHECK("fixed read len", cons.Read(out, sizeof(out)), 12u);
+  CHECK("fixed read data", out[0] == 0 && out[11] == 0, true);
+  CHECK("skip small out", cons.Read(out, 4), 0u);
+  CHECK("fixed read next", cons.Read(out, sizeof(out)), 12u);
+  CHECK("fixed read next data", out[0], 2);
+  CHECK("writeable after read", prod.WriteableBytes(), 36u);
+
+  // Slot index wraps back to slot 0 once the last slot has been used
+  std::memset(msg, 0x42, sizeof(msg));
+  for (int i = 0; i < 3; ++i) {
+    CHECK("fixed wrap write", prod.Write(msg, sizeof(msg)), true);
+  }
+  for (int i = 3; i < 8; ++i) {
+    cons.Read(out, sizeof(out));
+  }
+  for (int i = 0; i < 3; ++i) {
+    CHECK("fixed wrap read", cons.Read(out, sizeof(out)) == 12u && out[5] == 0x42, true);
+  }
+  CHECK("fixed empty", cons.HasData(), false);
+  CHECK("fixed producer has_data", prod.HasData(), false);
+  CHECK("fixed consumer writeable", cons.WriteableBytes(), 96u);
+
+  // Rings of the other kind or size are rejected
+  CHECK("reject msg_size",
+        shm::FixedSizeRingBuffer(mem.data(), shm::kHeaderSize + 100, 16, false).IsCompatible(),
+        false);
+  CHECK("byte ring rejects fixed",
+        shm::ByteRingBuffer(mem.data(), shm::kHeaderSize + 100, false).IsCompatible(), false);
+  std::vector<uint8_t> mem2(shm::kHeaderSize + 64, 0);
+  shm::ByteRingBuffer byte_ring(mem2.data(), shm::kHeaderSize + 64, true);
+  CHECK("fixed rejects byte ring",
+        shm::FixedSizeRingBuffer(mem2.data(), shm::kHeaderSize + 64, 12, false).IsCompatible(),
+        false);
+}
+
 // ---- ShmChannel tests (requires POSIX/Windows shared memory) ----
 
 void test_shm_channel() {
@@ -251,21 +408,56 @@ void test_shm_multiple_messages() {
   }
 }
 
+void test_shm_fixed_size() {
+  std::printf("test_shm_fixed_size\n");
+  const char* name = "test_shm_fixed";
+  shm::RemoveSharedMemory(name);
+
+  {
+    shm::ShmProducer prod(name, 4 * 16, /*msg_size=*/16);
+    CHECK("fixed producer valid", prod.IsValid(), true);
+    CHECK("fixed producer capacity", prod.Capacity(), 64u);
+    CHECK("fixed producer reject size", prod.Write("short", 5), false);
+    CHECK("fixed producer write", prod.Write("0123456789abcdef", 16), true);
+
+    shm::ShmConsumer fixed_cons(name, 4 * 16 + shm::kHeaderSize, 16);
+    CHECK("fixed consumer valid", fixed_cons.IsValid(), true);
+    CHECK("fixed consumer has_data", fixed_cons.HasData(), true);
+    char out[16] = {};
+    CHECK("fixed consumer read", fixed_cons.Read(out, sizeof(out)), 16u);
+    CHECK("fixed consumer data", std::memcmp(out, "0123456789abcdef", 16) == 0, true);
+
+    shm::ShmConsumer byte_cons(name, 4 * 16 + shm::kHeaderSize);
+    CHECK("byte consumer rejects fixed", byte_cons.IsValid(), false);
+    shm::ShmConsumer other_cons(name, 4 * 16 + shm::kHeaderSize, 8);
+    CHECK("fixed consumer rejects msg_size", other_cons.IsValid(), false);
+
+    prod.Destroy();
+  }
+}
+
 int main() {
   std::printf("=== ByteRingBuffer Tests ===\n");
   test_basic_write_read();
   test_multiple_messages();
   test_wrap_around();
+  test_wrap_marker();
+  test_wrap_marker_alone();
   test_full_buffer();
   test_producer_consumer_views();
   test_large_message();
   test_has_data();
   test_message_too_large_for_output();
   test_round_down_pow2();
+  test_header_layout();
+
+  std::printf("\n=== FixedSizeRingBuffer Tests ===\n");
+  test_fixed_size();
 
   std::printf("\n=== ShmChannel Tests ===\n");
   test_shm_channel();
   test_shm_multiple_messages();
+  test_shm_fixed_size();
 
   std::printf("\n=== Results: %d passed, %d failed ===\n", passed, failed);
   return failed > 0 ? 1 : 0;
@@ -5,11 +5,12 @@ import sys
 
 sys.path.insert(0, ".")
 
+from byte_ring_buffer import HEADER_SIZE
 from shm_channel import ShmConsumer
 
 expected = ["hello_from_cpp", "message_2", "cross_language_test", "1234567890", "end"]
 
-consumer = ShmConsumer("test_cross_lang", size=4096 + 16)
+consumer = ShmConsumer("test_cross_lang", size=4096 + HEADER_SIZE)
 passed = 0
 failed = 0
 
@@ -31,5 +32,17 @@ else:
     print(f"  FAIL: expected None, got {data!r}")
 
 consumer.close()
+
+# Fixed-size channel: 16-byte messages without length prefix
+fixed_consumer = ShmConsumer("test_cross_lang_fixed", size=4096 + HEADER_SIZE, msg_size=16)
+got = fixed_consumer.read_many()
+fixed_expected = [f"fixed_msg_00000{i}".encode() for i in (1, 2, 3)]
+if got == fixed_expected:
+    passed += 1
+    print("  PASS: read 3 fixed-size messages")
+else:
+    failed += 1
+    print(f"  FAIL: expected {fixed_expected!r}, got {got!r}")
+fixed_consumer.close()
 print(f"\nCross-language: {passed} passed, {failed} failed")
 sys.exit(1 if failed > 0 else 0)
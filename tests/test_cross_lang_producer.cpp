@@ -22,6 +22,20 @@ int main() {
     std::printf("C++ wrote: %s\n", msgs[i]);
   }
 
+  // Fixed-size channel: 16-byte messages, no length prefix
+  const char* fixed_name = "test_cross_lang_fixed";
+  shm::RemoveSharedMemory(fixed_name);
+  shm::ShmProducer fixed_prod(fixed_name, 4096, /*msg_size=*/16);
+  if (!fixed_prod.IsValid()) {
+    std::fprintf(stderr, "Failed to create fixed-size shm\n");
+    return 1;
+  }
+  const char* fixed_msgs[] = {"fixed_msg_000001", "fixed_msg_000002", "fixed_msg_000003"};
+  for (int i = 0; i < 3; ++i) {
+    fixed_prod.Write(fixed_msgs[i], 16);
+    std::printf("C++ wrote (fixed): %s\n", fixed_msgs[i]);
+  }
+
   std::printf("C++ producer done. Run Python consumer now.\n");
   // Don't destroy - let Python read it
   return 0;
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Unit tests for shm_channel huge-page segments.
+
+hugetlbfs is emulated with a temporary directory, so the tests run without
+reserved huge pages.
+
+Usage:
+    python test_shm_channel.py
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from multiprocessing.shared_memory import SharedMemory
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "py"))
+
+import shm_channel
+from byte_ring_buffer import ByteRingBuffer, HEADER_SIZE
+from shm_channel import ShmConsumer, ShmProducer
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "huge pages are Linux only")
+class TestHugePages(unittest.TestCase):
+    """测试 hugetlbfs 共享内存段"""
+
+    SHM_NAME = "test_shm_hugepages"
+    CAPACITY = 8192
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, self.SHM_NAME)
+        for p in (
+            patch.object(shm_channel, "_HUGEPAGE_DIR", self._dir.name),
+            patch.object(shm_channel, "_HUGEPAGE_SIZE", 4096),
+        ):
+            p.start()
+            self.addCleanup(p.stop)
+        self.addCleanup(self._dir.cleanup)
+
+    def test_roundtrip(self):
+        """测试生产者创建大页段，消费者通过大页文件读取"""
+        producer = ShmProducer(self.SHM_NAME, self.CAPACITY, huge_pages=True)
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(producer.capacity, self.CAPACITY)
+
+        consumer = ShmConsumer(self.SHM_NAME)
+        self.assertTrue(producer.write(b"huge"))
+        self.assertEqual(consumer.read(), b"huge")
+
+        consumer.close()
+        producer.destroy()
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_small_capacity_uses_regular_shm(self):
+        """测试容量小于一个大页时不使用大页"""
+        producer = ShmProducer(self.SHM_NAME, 1024, huge_pages=True)
+        self.assertFalse(os.path.exists(self.path))
+        producer.destroy()
+
+    def test_fallback_on_error(self):
+        """测试大页不可用时退化为普通共享内存"""
+        with patch.object(
+            shm_channel._HugePageMemory, "__init__", side_effect=OSError(12, "ENOMEM")
+        ):
+            producer = ShmProducer(self.SHM_NAME, self.CAPACITY, huge_pages=True)
+        consumer = ShmConsumer(self.SHM_NAME)
+        self.assertTrue(producer.write(b"regular"))
+        self.assertEqual(consumer.read(), b"regular")
+        consumer.close()
+        producer.destroy()
+
+    def test_stale_file_does_not_shadow_live_segment(self):
+        """测试残留的大页文件不会遮蔽新的普通共享内存段（如 C++ 生产者创建的）"""
+        stale = ShmProducer(self.SHM_NAME, self.CAPACITY, huge_pages=True)
+        stale.write(b"OLD")
+        stale.close()  # 不 unlink，大页文件残留
+        self.assertTrue(os.path.exists(self.path))
+
+        # 模拟只使用普通共享内存的 C++ 生产者
+        shm = SharedMemory(name=self.SHM_NAME, create=True, size=self.CAPACITY + HEADER_SIZE)
+        ring = ByteRingBuffer(shm.buf, is_producer=True)
+        ring.write(b"NEW")
+
+        consumer = ShmConsumer(self.SHM_NAME)
+        self.assertEqual(consumer.read(), b"NEW")
+
+        consumer.close()
+        del ring
+        shm.close()
+        shm.unlink()
+        os.unlink(self.path)
+
+    def test_producer_removes_stale_file(self):
+        """测试普通生产者启动时删除同名残留大页文件"""
+        ShmProducer(self.SHM_NAME, self.CAPACITY, huge_pages=True).close()
+        self.assertTrue(os.path.exists(self.path))
+
+        producer = ShmProducer(self.SHM_NAME, self.CAPACITY)
+        self.assertFalse(os.path.exists(self.path))
+        producer.destroy()
+
+
+def run_tests():
+    """运行所有测试"""
+    loader = unittest.TestLoader()
+    suite = loader.loadTestsFromTestCase(TestHugePages)
+    runner = unittest.TextTestRunner(verbosity=2)
+    result = runner.run(suite)
+    return result.wasSuccessful()
+
+
+if __name__ == "__main__":
+    success = run_tests()
+    sys.exit(0 if success else 1)